@@ -0,0 +1,105 @@
+"""
+Teste de estresse de concorrência do armazenamento.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.estresse --processos 8 --operacoes 40
+
+Vários processos incluem jogos na mesma coleção ao mesmo tempo, pelo caminho
+de transacao() e pelo de commit_em_grupo(), em cada layout de armazenamento.
+Ao final, o arquivo precisa conter exatamente processos × operações jogos
+(nenhuma alteração perdida) e cada título uma única vez; se não contiver, o
+processo termina com código 1.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from src.minha_jogatina.armazenamento import Armazenamento, ArmazenamentoFragmentado
+
+LAYOUTS = {
+    "unico": (Armazenamento, "colecoes.json"),
+    "fragmentado": (ArmazenamentoFragmentado, os.path.join("fragmentado", "manifesto.json")),
+}
+MODOS = ["transacao", "grupo"]
+COLECAO = "Estresse"
+
+
+def _jogo(processo: int, i: int) -> dict:
+    return {
+        "title": f"P{processo:02d} J{i:04d}",
+        "genero": "RPG",
+        "platform": "PC",
+        "status": "JOGANDO",
+        "horas_jogadas": float(i),
+        "avaliacao": None,
+    }
+
+
+def _trabalhador(layout: str, caminho: str, modo: str, processo: int, operacoes: int) -> None:
+    classe, _ = LAYOUTS[layout]
+    arm = classe.carregar(caminho)
+    if modo == "transacao":
+        for i in range(operacoes):
+            arm.transacao(lambda a, i=i: a.adicionar_jogo(COLECAO, _jogo(processo, i)))
+    else:
+        # Lotes pequenos para forçar vários descarregamentos (e conflitos) por processo
+        with arm.commit_em_grupo(intervalo=0.01, tamanho_lote=5):
+            for i in range(operacoes):
+                arm.transacao(lambda a, i=i: a.adicionar_jogo(COLECAO, _jogo(processo, i)))
+
+
+def executar(layout: str, modo: str, processos: int, operacoes: int, diretorio: str) -> List[str]:
+    """Roda um cenário e retorna a lista de problemas encontrados (vazia se passou)."""
+    classe, relativo = LAYOUTS[layout]
+    caminho = os.path.join(diretorio, layout, modo, relativo)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    arm = classe.carregar(caminho)
+    arm.criar_colecao(COLECAO)
+    arm.salvar()
+
+    filhos = [multiprocessing.Process(target=_trabalhador, args=(layout, caminho, modo, p, operacoes))
+              for p in range(processos)]
+    for filho in filhos:
+        filho.start()
+    for filho in filhos:
+        filho.join()
+
+    problemas = [f"processo {i} terminou com código {f.exitcode}" for i, f in enumerate(filhos) if f.exitcode]
+    titulos = [g["title"] for g in classe.carregar(caminho).jogos(COLECAO)]
+    esperados = processos * operacoes
+    if len(titulos) != esperados:
+        problemas.append(f"{len(titulos)} jogos gravados, esperados {esperados}")
+    if len(set(titulos)) != len(titulos):
+        problemas.append(f"{len(titulos) - len(set(titulos))} títulos repetidos")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="estresse")
+    parser.add_argument("--processos", type=int, default=8)
+    parser.add_argument("--operacoes", type=int, default=40, help="Inclusões por processo")
+    parser.add_argument("--layouts", default="unico,fragmentado")
+    parser.add_argument("--modos", default=",".join(MODOS))
+    args = parser.parse_args()
+
+    falhou = False
+    with tempfile.TemporaryDirectory() as diretorio:
+        for layout in args.layouts.split(","):
+            for modo in args.modos.split(","):
+                inicio = time.perf_counter()
+                problemas = executar(layout, modo, args.processos, args.operacoes, diretorio)
+                duracao = time.perf_counter() - inicio
+                resultado = "ok" if not problemas else "FALHOU: " + "; ".join(problemas)
+                print(f"{layout:<12} {modo:<10} {duracao:6.2f}s  {resultado}")
+                falhou = falhou or bool(problemas)
+    if falhou:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
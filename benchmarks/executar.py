@@ -0,0 +1,230 @@
+"""
+Benchmarks do armazenamento, dos relatórios e dos comandos da CLI.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.executar --tamanhos 1000,100000,1000000 --saida resultados.json
+    python -m benchmarks.executar --tamanhos 1000 --comparar resultados.json
+
+Para cada tamanho de catálogo e layout de armazenamento, um catálogo sintético é
+gerado em um diretório temporário e cada operação é cronometrada `--repeticoes`
+vezes. O resultado é um JSON com os tempos (mínimo, mediana e média, em segundos).
+Com `--comparar`, os tempos são comparados a um resultado anterior e o processo
+termina com código 1 se alguma operação ficou mais lenta que a tolerância.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from main import _construir_jogos_de_armazenamento
+from src.minha_jogatina import duplicados
+from src.minha_jogatina.armazenamento import Armazenamento, ArmazenamentoFragmentado
+from src.minha_jogatina.models.relatorio import Relatorio
+from src.minha_jogatina.models.status import StatusJogo
+
+from .gerador import GeradorCatalogo
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Layout -> (classe, caminho relativo ao HOME usado pela CLI)
+LAYOUTS = {
+    "unico": (Armazenamento, ".minha_jogatina_colecoes.json"),
+    "fragmentado": (ArmazenamentoFragmentado, os.path.join(".minha_jogatina", "manifesto.json")),
+}
+
+# Relatórios cronometrados: nome -> chamada sobre uma instância de Relatorio
+RELATORIOS: Dict[str, Callable[[Relatorio], Any]] = {
+    "total_horas": lambda r: r.total_horas(),
+    "media_avaliacao_finalizados": lambda r: r.media_avaliacao_finalizados(),
+    "percentual_por_status": lambda r: r.percentual_por_status(),
+    "top_5_mais_jogados": lambda r: r.top_5_mais_jogados(),
+    "filtrar_por_genero": lambda r: r.filtrar_por_genero("RPG"),
+    "filtrar_por_plataforma": lambda r: r.filtrar_por_plataforma("PC"),
+    "filtrar_por_status": lambda r: r.filtrar_por_status(StatusJogo.FINALIZADO),
+    "buscar_por_titulo": lambda r: r.buscar_por_titulo("00042"),
+    "ordenar_por_horas": lambda r: r.ordenar_por_horas(),
+    "ordenar_por_avaliacao": lambda r: r.ordenar_por_avaliacao(),
+    "ordenar_por_horas_limite_20": lambda r: r.ordenar_por_horas(limite=20),
+    "filtrar_por_genero_limite_20": lambda r: r.filtrar_por_genero("RPG", limite=20),
+}
+
+
+def medir(funcao: Callable[[], Any], repeticoes: int) -> Dict[str, float]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        "min_s": min(tempos),
+        "mediana_s": statistics.median(tempos),
+        "media_s": statistics.fmean(tempos),
+    }
+
+
+def preparar_catalogo(home: str, layout: str, catalogo: Dict[str, Any]) -> str:
+    """Grava o catálogo no layout pedido dentro de `home` e retorna o caminho principal."""
+    classe, relativo = LAYOUTS[layout]
+    caminho = os.path.join(home, relativo)
+    arm = classe.carregar(caminho)
+    for nome, col in catalogo["collections"].items():
+        arm.criar_colecao(nome)
+        arm.colecoes[nome]["games"].extend(dict(g) for g in col["games"])
+    arm.salvar()
+    return caminho
+
+
+def executar_caso(home: str, layout: str, catalogo: Dict[str, Any], repeticoes: int,
+                  cli: bool) -> List[Dict[str, Any]]:
+    classe, _ = LAYOUTS[layout]
+    caminho = preparar_catalogo(home, layout, catalogo)
+    nomes = list(catalogo["collections"])
+    colecao = nomes[len(nomes) // 2]
+    jogos_col = catalogo["collections"][colecao]["games"]
+    alvo = jogos_col[len(jogos_col) // 2]["title"]
+    contador = itertools.count()
+    resultados = []
+
+    def registrar(operacao: str, funcao: Callable[[], Any], vezes: int = repeticoes):
+        resultados.append({"operacao": operacao, **medir(funcao, vezes)})
+
+    # --- Armazenamento ---
+    registrar("carregar", lambda: classe.carregar(caminho))
+    registrar("carregar_uma_colecao", lambda: classe.carregar(caminho).jogos(colecao))
+
+    arm = classe.carregar(caminho)
+    arm.jogos(colecao)
+    registrar("construir_indice", lambda: (arm._indices.clear(), arm.buscar_jogo(colecao, alvo)))
+    registrar("buscar_jogo", lambda: arm.buscar_jogo(colecao, alvo))
+
+    def atualizar():
+        arm.atualizar_jogo(colecao, alvo, {"horas_jogadas": 10000.0 + next(contador)})
+
+    registrar("atualizar_em_memoria", atualizar)
+    registrar("salvar", lambda: (atualizar(), arm.salvar()))
+    registrar("transacao_atualizar", lambda: arm.transacao(lambda a: atualizar()))
+
+    def adicionar():
+        jogo = dict(alvo_dict, title=f"Extra {next(contador)}")
+        arm.transacao(lambda a: a.adicionar_jogo(colecao, dict(jogo)))
+
+    alvo_dict = dict(arm.buscar_jogo(colecao, alvo))
+    registrar("transacao_adicionar", adicionar)
+
+    # --- Índices ordenados (construídos uma vez, depois mantidos a cada alteração) ---
+    registrar("indices_construir", lambda: (arm._ordenados.clear(), arm.indices_ordenados()))
+    registrar("indices_atualizar", atualizar)
+    registrar("ranking_horas_limite_20", lambda: list(itertools.islice(arm.ranking("horas"), 20)))
+    registrar("faixa_horas_10_50", lambda: sum(1 for _ in arm.faixa("horas", 10, 50)))
+    registrar("posicao_jogo", lambda: arm.posicao("horas", colecao, alvo, todas=True))
+
+    # --- Estatísticas (uma passada por coleção; com resumos guardados, só a mescla) ---
+    registrar("estatisticas_resumir", lambda: arm.resumo_estatistico())
+    arm.resumo_estatistico(guardar=True)
+    registrar("estatisticas_guardadas", lambda: arm.resumo_estatistico())
+    registrar("duplicados_encontrar", lambda: duplicados.duplicados(arm.percorrer_jogos()))
+
+    # --- Reconstrução dos objetos Jogo e relatórios ---
+    registrar("construir_jogos_todas", lambda: _construir_jogos_de_armazenamento(arm, None))
+    registrar("construir_jogos_colecao", lambda: _construir_jogos_de_armazenamento(arm, colecao))
+    relatorio = Relatorio(_construir_jogos_de_armazenamento(arm, None))
+    for nome, chamada in RELATORIOS.items():
+        registrar(f"relatorio.{nome}", lambda chamada=chamada: chamada(relatorio))
+
+    # --- Comandos da CLI (processo completo, inclui a inicialização do Python) ---
+    if cli:
+        ambiente = dict(os.environ, HOME=home)
+        comandos = {
+            "listar-colecoes": ["listar-colecoes"],
+            "total-horas": ["total-horas"],
+            "total-horas --colecao": ["total-horas", "--colecao", colecao],
+            "ordenar-por-horas": ["ordenar-por-horas"],
+        }
+        for nome, argumentos in comandos.items():
+            registrar(f"cli.{nome}", lambda argumentos=argumentos: subprocess.run(
+                [sys.executable, os.path.join(RAIZ, "main.py"), *argumentos],
+                env=ambiente, stdout=subprocess.DEVNULL, check=True))
+        registrar("cli.atualizar-jogo", lambda: subprocess.run(
+            [sys.executable, os.path.join(RAIZ, "main.py"), "atualizar-jogo", colecao, alvo,
+             "--horas", str(20000.0 + next(contador))],
+            env=ambiente, stdout=subprocess.DEVNULL, check=True))
+
+    return resultados
+
+
+def comparar(atuais: List[Dict[str, Any]], arquivo_base: str, tolerancia: float) -> bool:
+    """Imprime a razão atual/base por operação; retorna True se houve regressão."""
+    with open(arquivo_base, "r", encoding="utf-8") as f:
+        base = {(r["tamanho"], r["layout"], r["operacao"]): r for r in json.load(f)["resultados"]}
+    regressao = False
+    for r in atuais:
+        anterior = base.get((r["tamanho"], r["layout"], r["operacao"]))
+        if not anterior or anterior["min_s"] <= 0:
+            continue
+        razao = r["min_s"] / anterior["min_s"]
+        marca = ""
+        if razao > tolerancia:
+            marca = "  <-- REGRESSÃO"
+            regressao = True
+        print(f"{r['tamanho']:>9} {r['layout']:<12} {r['operacao']:<40} {razao:6.2f}x{marca}",
+              file=sys.stderr)
+    return regressao
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks")
+    parser.add_argument("--tamanhos", default="1000,100000,1000000",
+                        help="Quantidades totais de jogos, separadas por vírgula")
+    parser.add_argument("--colecoes", type=int, default=10)
+    parser.add_argument("--layouts", default="unico,fragmentado")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--cli", action="store_true", help="Também cronometra comandos de main.py")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", help="Resultado anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=1.2)
+    args = parser.parse_args()
+
+    gerador = GeradorCatalogo(semente=args.semente)
+    resultados = []
+    for tamanho in (int(t) for t in args.tamanhos.split(",")):
+        catalogo = gerador.catalogo(args.colecoes, max(1, tamanho // args.colecoes))
+        for layout in args.layouts.split(","):
+            print(f"{tamanho} jogos, layout {layout}...", file=sys.stderr)
+            with tempfile.TemporaryDirectory() as home:
+                for r in executar_caso(home, layout, catalogo, args.repeticoes, args.cli):
+                    resultados.append({"tamanho": tamanho, "layout": layout, **r})
+
+    saida = {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semente": args.semente,
+            "colecoes": args.colecoes,
+            "repeticoes": args.repeticoes,
+        },
+        "resultados": resultados,
+    }
+    texto = json.dumps(saida, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto)
+    else:
+        print(texto)
+
+    if args.comparar and comparar(resultados, args.comparar, args.tolerancia):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
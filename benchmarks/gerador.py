@@ -0,0 +1,68 @@
+"""
+Gerador determinístico de catálogos sintéticos para os benchmarks.
+
+Os jogos são gerados já no formato do armazenamento da CLI (chaves "title",
+"platform", etc.) e respeitam as regras de Jogo: jogos finalizados têm pelo
+menos 1h e só eles recebem avaliação. A mesma semente sempre gera o mesmo catálogo.
+"""
+
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+GENEROS_PADRAO = {
+    "RPG": 0.25,
+    "Aventura": 0.2,
+    "Ação": 0.2,
+    "Estratégia": 0.1,
+    "Esporte": 0.1,
+    "Puzzle": 0.1,
+    "Terror": 0.05,
+}
+PLATAFORMAS_PADRAO = {"PC": 0.5, "Console": 0.35, "Mobile": 0.15}
+STATUS_PADRAO = {"NÃO INICIADO": 0.3, "JOGANDO": 0.3, "FINALIZADO": 0.4}
+
+
+class GeradorCatalogo:
+    def __init__(self, semente: int = 42,
+                 generos: Optional[Dict[str, float]] = None,
+                 plataformas: Optional[Dict[str, float]] = None,
+                 status: Optional[Dict[str, float]] = None):
+        self.semente = semente
+        self.generos = generos or GENEROS_PADRAO
+        self.plataformas = plataformas or PLATAFORMAS_PADRAO
+        self.status = status or STATUS_PADRAO
+
+    def _sortear(self, rng: random.Random, distribuicao: Dict[str, float], n: int) -> List[str]:
+        return rng.choices(list(distribuicao), weights=list(distribuicao.values()), k=n)
+
+    def jogos(self, quantidade: int, prefixo: str = "Jogo") -> Iterator[Dict[str, Any]]:
+        """Gera `quantidade` jogos com títulos únicos dentro do prefixo."""
+        rng = random.Random(f"{self.semente}-{prefixo}")
+        generos = self._sortear(rng, self.generos, quantidade)
+        plataformas = self._sortear(rng, self.plataformas, quantidade)
+        status = self._sortear(rng, self.status, quantidade)
+        for i in range(quantidade):
+            st = status[i]
+            if st == "NÃO INICIADO":
+                horas = 0.0
+            elif st == "FINALIZADO":
+                horas = round(1.0 + rng.expovariate(1 / 30), 1)
+            else:
+                horas = round(rng.expovariate(1 / 15), 1)
+            yield {
+                "title": f"{prefixo} {i:07d}",
+                "genero": generos[i],
+                "platform": plataformas[i],
+                "status": st,
+                "horas_jogadas": horas,
+                "avaliacao": round(rng.uniform(0, 10), 1) if st == "FINALIZADO" else None,
+            }
+
+    def catalogo(self, colecoes: int, jogos_por_colecao: int) -> Dict[str, Any]:
+        """Monta o dicionário completo do armazenamento ({"collections": {...}})."""
+        return {
+            "collections": {
+                f"Coleção {c:03d}": {"games": list(self.jogos(jogos_por_colecao, prefixo=f"C{c:03d}"))}
+                for c in range(colecoes)
+            }
+        }
@@ -7,7 +7,11 @@ Implementa uma CLI (Command Line Interface) para gerenciar coleções de jogos.
 import argparse
 import json
 import os
-from typing import Dict, Any, List
+import sys
+from contextlib import nullcontext
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from src.minha_jogatina.models import (
     StatusJogo,
@@ -17,32 +21,71 @@ from src.minha_jogatina.models import (
 )
 from src.minha_jogatina.models.relatorio import Relatorio
 from src.minha_jogatina.dados import RepositorioDados
+from src.minha_jogatina.armazenamento import Armazenamento, ArmazenamentoFragmentado
+from src.minha_jogatina import perfil
+from src.minha_jogatina import csv_jogos
+from src.minha_jogatina import duplicados
+from src.minha_jogatina import paginacao
+from src.minha_jogatina import sessoes
 
 # Caminho onde os dados das coleções serão armazenados no sistema de arquivos do usuário
 CAMINHO_ARMAZENAMENTO = os.path.expanduser("~/.minha_jogatina_colecoes.json")
 
+# Manifesto do layout fragmentado (um arquivo por coleção). Se existir, tem prioridade.
+CAMINHO_MANIFESTO = os.path.expanduser("~/.minha_jogatina/manifesto.json")
 
-def carregar_armazenamento() -> Dict[str, Any]:
+# Registro das sessões de jogo (os resumos por período ficam em "<caminho>.resumos.json")
+CAMINHO_SESSOES = os.path.expanduser("~/.minha_jogatina_sessoes.log")
+
+# Preferências do usuário (ex.: meta anual de jogos finalizados)
+CAMINHO_CONFIGURACAO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    "src", "minha_jogatina", "configuracao.json")
+
+
+def carregar_armazenamento() -> Armazenamento:
     """
     Carrega o arquivo JSON com as coleções de jogos do sistema.
     
-    Se o arquivo não existir, retorna um dicionário vazio com estrutura padrão.
+    Se o arquivo não existir, retorna um armazenamento vazio com estrutura padrão.
     Isso garante que sempre teremos a estrutura esperada mesmo na primeira execução.
+
+    Se o layout fragmentado estiver em uso (existe o manifesto), apenas o manifesto
+    é lido aqui; cada coleção é lida do seu próprio arquivo quando for acessada.
     """
-    if not os.path.exists(CAMINHO_ARMAZENAMENTO):
-        return {"collections": {}}
-    with open(CAMINHO_ARMAZENAMENTO, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if os.path.exists(CAMINHO_MANIFESTO):
+        return ArmazenamentoFragmentado.carregar(CAMINHO_MANIFESTO)
+    return Armazenamento.carregar(CAMINHO_ARMAZENAMENTO)
 
 
-def salvar_armazenamento(armazenamento: Dict[str, Any]):
+def salvar_armazenamento(armazenamento: Armazenamento):
     """
     Persiste o armazenamento em memória para o arquivo JSON.
     
     Garante que todas as alterações feitas nas coleções e jogos sejam salvos permanentemente.
     """
-    with open(CAMINHO_ARMAZENAMENTO, "w", encoding="utf-8") as f:
-        json.dump(armazenamento, f, indent=2, ensure_ascii=False)
+    armazenamento.salvar()
+
+
+def carregar_configuracao() -> Dict[str, Any]:
+    """Lê o configuracao.json (ou retorna um dicionário vazio se ele não existir)."""
+    try:
+        with open(CAMINHO_CONFIGURACAO, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _sessao_da_alteracao(jogo: Dict[str, Any], horas_antes: float, alterados: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sessão de jogo correspondente a uma atualização, ou {} se não houve sessão.
+
+    Uma sessão existe quando as horas aumentaram ou o status mudou; `jogo` é o
+    dicionário já atualizado e `alterados` o delta retornado por atualizar_jogo().
+    """
+    horas = float(alterados.get("horas_jogadas", horas_antes)) - horas_antes
+    if horas <= 0 and "status" not in alterados:
+        return {}
+    return {"jogo": dict(jogo), "horas": max(horas, 0.0), "status": alterados.get("status")}
 
 
 def _status_de_str(s: str) -> StatusJogo:
@@ -120,7 +163,7 @@ def validar_avaliacao(valor):
     return 0 <= valor <= 10
 
 
-def _construir_jogos_de_armazenamento(armazenamento: Dict[str, Any], colecao_nome: str = None) -> List:
+def _construir_jogos_de_armazenamento(armazenamento: Armazenamento, colecao_nome: str = None) -> List:
     """
     Reconstrói lista de objetos Jogo a partir do armazenamento JSON.
     
@@ -131,18 +174,98 @@ def _construir_jogos_de_armazenamento(armazenamento: Dict[str, Any], colecao_nom
     Retorna:
         Lista de objetos Jogo completos (com validações e comportamentos)
     """
-    jogos = []
+    # Os registros são contados por _iterar_jogos_de_armazenamento()
+    with perfil.fase("jogos.reconstruir"):
+        return list(_iterar_jogos_de_armazenamento(armazenamento, colecao_nome))
+
+
+def _iterar_jogos_de_armazenamento(armazenamento: Armazenamento, colecao_nome: str = None) -> Iterator:
+    """
+    Versão preguiçosa de _construir_jogos_de_armazenamento().
+
+    Cada objeto Jogo só é reconstruído quando é pedido, então uma listagem
+    paginada que para cedo (ex.: filtro com --limite) não reconstrói o resto.
+    Cada jogo reconstruído conta como um registro processado no perfil.
+    """
     if colecao_nome:
         # Se uma coleção específica foi solicitada, busca apenas seus jogos
-        col = armazenamento["collections"].get(colecao_nome, {})
+        col = armazenamento.colecoes.get(colecao_nome, {})
         for g_dict in col.get("games", []):
-            jogos.append(_jogo_de_dict(g_dict))
+            perfil.contar(registros=1)
+            yield _jogo_de_dict(g_dict)
     else:
         # Se nenhuma coleção foi especificada, busca jogos de TODAS as coleções
-        for col_name, col_data in armazenamento["collections"].items():
+        for col_name, col_data in armazenamento.colecoes.items():
             for g_dict in col_data.get("games", []):
-                jogos.append(_jogo_de_dict(g_dict))
-    return jogos
+                perfil.contar(registros=1)
+                yield _jogo_de_dict(g_dict)
+
+
+def _ler_paginacao(args: argparse.Namespace) -> Tuple[Optional[int], int, Optional[list]]:
+    """
+    Interpreta --limite, --offset e --cursor.
+
+    Retorna (limite, offset, apos). O limite pedido ao relatório é um a mais que
+    --limite, para saber se existe uma próxima página. `apos` só vem preenchido
+    quando o cursor é de uma listagem ordenada.
+    """
+    offset = args.offset
+    apos = None
+    if args.cursor:
+        estado = paginacao.decodificar_cursor(args.cursor)
+        offset = estado.get("offset", 0)
+        apos = estado.get("apos")
+    limite = args.limite + 1 if args.limite is not None else None
+    return limite, offset, apos
+
+
+def _valor(numero: Optional[float]) -> str:
+    return "-" if numero is None else f"{numero:g}"
+
+
+def _exibir_estatisticas(r: Dict[str, Any]) -> None:
+    """Imprime o relatório de um Resumo (ver estatisticas.Resumo.relatorio())."""
+    print(f"Jogos: {r['jogos']} | Horas: {r['horas_total']:.1f}")
+    print(f"Horas por jogo: mediana {_valor(r['horas']['mediana'])} | "
+          f"p90 {_valor(r['horas']['p90'])} | máximo {_valor(r['horas']['maximo'])}")
+    print(f"Avaliação ({r['avaliacao']['avaliados']} finalizados avaliados): "
+          f"mediana {_valor(r['avaliacao']['mediana'])} | p90 {_valor(r['avaliacao']['p90'])}")
+    for status, quantidade in r["por_status"].items():
+        print(f"{status}: {quantidade}")
+    print("Histograma de horas:")
+    maior = max(r["histograma_horas"].values(), default=0) or 1
+    for faixa, quantidade in r["histograma_horas"].items():
+        print(f"  {faixa:>10} {quantidade:>8} {'#' * round(40 * quantidade / maior)}")
+
+
+def _pagina_ordenada(triplas: Iterator, offset: int) -> Tuple[List, List]:
+    """
+    Converte em objetos Jogo só a página pedida de um ranking do armazenamento.
+
+    `triplas` são as (coleção, jogo, chave) geradas por Armazenamento.ranking()/faixa()
+    com limite offset + --limite, já na ordem final, então basta pular `offset` itens.
+    Retorna os jogos e as chaves deles (usadas no cursor da próxima página).
+    """
+    pagina = list(islice(triplas, offset, None))
+    return [_jogo_de_dict(g_dict) for _, g_dict, _ in pagina], [c for _, _, c in pagina]
+
+
+def _exibir_pagina(args: argparse.Namespace, itens: List, texto, offset: int,
+                   registro=paginacao.registro_de_jogo, chaves: Optional[List] = None):
+    """
+    Exibe a página no formato pedido e, se houver mais itens, o cursor da próxima.
+
+    Para listagens ordenadas (`chaves` informadas, uma por item), o cursor guarda a
+    chave do último item exibido; nas demais, a posição onde a próxima página começa.
+    """
+    proximo = None
+    if args.limite is not None and len(itens) > args.limite:
+        itens = itens[:args.limite]
+        if chaves is not None:
+            proximo = paginacao.codificar_cursor({"apos": list(chaves[args.limite - 1])})
+        else:
+            proximo = paginacao.codificar_cursor({"offset": offset + args.limite})
+    paginacao.emitir(itens, args.formato, texto, registro, proximo)
 
 
 def main():
@@ -158,8 +281,21 @@ def main():
     """
     # Criador do parser de linha de comando
     parser = argparse.ArgumentParser(prog="minha-jogatina")
+    # Opções globais de perfil (também ativadas pela variável MINHA_JOGATINA_PERFIL:
+    # "1" imprime o resumo; outro valor é usado como arquivo de saída)
+    parser.add_argument("--perfil", action="store_true",
+                        help="Mede o tempo de cada fase do comando e exibe um resumo")
+    parser.add_argument("--perfil-saida",
+                        help="Grava o perfil em JSON (ou estatísticas do cProfile se terminar em .prof)")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
+    # Opções de paginação e formato compartilhadas pelos comandos de listagem
+    opcoes_pagina = argparse.ArgumentParser(add_help=False)
+    opcoes_pagina.add_argument("--limite", type=int, help="Quantidade máxima de itens exibidos")
+    opcoes_pagina.add_argument("--offset", type=int, default=0, help="Quantidade de itens pulados")
+    opcoes_pagina.add_argument("--cursor", help="Continua a partir da página anterior")
+    opcoes_pagina.add_argument("--formato", choices=paginacao.FORMATOS, default="texto")
+
     # ===== COMANDOS PARA GERENCIAR COLEÇÕES =====
     sub.add_parser("listar-colecoes")
 
@@ -170,7 +306,7 @@ def main():
     p_deletar.add_argument("nome")
 
     # ===== COMANDOS PARA GERENCIAR JOGOS =====
-    p_listar = sub.add_parser("listar-jogos")
+    p_listar = sub.add_parser("listar-jogos", parents=[opcoes_pagina])
     p_listar.add_argument("colecao")
 
     p_add = sub.add_parser("adicionar-jogo")
@@ -201,6 +337,34 @@ def main():
     p_reiniciar.add_argument("colecao")
     p_reiniciar.add_argument("titulo")
 
+    p_lote = sub.add_parser("registrar-horas-lote")
+    p_lote.add_argument("arquivo", help="Arquivo com linhas 'colecao<TAB>titulo<TAB>horas' ('-' para stdin)")
+    p_lote.add_argument("--intervalo", type=float, default=1.0)
+    p_lote.add_argument("--tamanho-lote", type=int, default=100)
+    p_lote.add_argument("--sincronizar", action="store_true")
+    p_lote.add_argument("--metricas", action="store_true")
+
+    # ===== COMANDOS DO HISTÓRICO DE SESSÕES =====
+    p_sessao = sub.add_parser("registrar-sessao")
+    p_sessao.add_argument("colecao")
+    p_sessao.add_argument("titulo")
+    p_sessao.add_argument("--horas", type=float, required=True, help="Horas jogadas nesta sessão")
+    p_sessao.add_argument("--status", help="Novo status do jogo ao fim da sessão")
+
+    p_historico = sub.add_parser("historico")
+    p_historico.add_argument("--de", type=date.fromisoformat, help="Data inicial (AAAA-MM-DD)")
+    p_historico.add_argument("--ate", type=date.fromisoformat, help="Data final (AAAA-MM-DD)")
+    p_historico.add_argument("--colecao")
+    p_historico.add_argument("--limite", type=int)
+
+    p_periodo = sub.add_parser("horas-por-periodo")
+    p_periodo.add_argument("--por", choices=sessoes.PERIODOS + ["genero"], default="mes")
+    p_periodo.add_argument("--de", type=date.fromisoformat, help="Data inicial (AAAA-MM-DD)")
+    p_periodo.add_argument("--ate", type=date.fromisoformat, help="Data final (AAAA-MM-DD)")
+
+    p_meta = sub.add_parser("meta-anual")
+    p_meta.add_argument("--ano", type=int)
+
     # ===== COMANDOS DE RELATÓRIOS =====
     p_total_horas = sub.add_parser("total-horas")
     p_total_horas.add_argument("--colecao")
@@ -214,28 +378,46 @@ def main():
     p_top5 = sub.add_parser("top-5-jogos")
     p_top5.add_argument("--colecao")
 
-    p_filtro_genero = sub.add_parser("filtrar-por-genero")
+    p_estat = sub.add_parser("estatisticas")
+    p_estat.add_argument("--colecao")
+    p_estat.add_argument("--por", choices=["genero", "plataforma"], help="Também exibe um resumo por grupo")
+    p_estat.add_argument("--formato", choices=["texto", "json"], default="texto")
+    p_estat.add_argument("--guardar", action="store_true",
+                         help="Grava os resumos calculados junto das coleções, para reaproveitá-los")
+
+    p_filtro_genero = sub.add_parser("filtrar-por-genero", parents=[opcoes_pagina])
     p_filtro_genero.add_argument("genero")
     p_filtro_genero.add_argument("--colecao")
 
-    p_filtro_plat = sub.add_parser("filtrar-por-plataforma")
+    p_filtro_plat = sub.add_parser("filtrar-por-plataforma", parents=[opcoes_pagina])
     p_filtro_plat.add_argument("plataforma", choices=["PC", "Console", "Mobile"])
     p_filtro_plat.add_argument("--colecao")
 
-    p_filtro_status = sub.add_parser("filtrar-por-status")
+    p_filtro_status = sub.add_parser("filtrar-por-status", parents=[opcoes_pagina])
     p_filtro_status.add_argument("status")
     p_filtro_status.add_argument("--colecao")
 
-    p_buscar = sub.add_parser("buscar-por-titulo")
+    p_buscar = sub.add_parser("buscar-por-titulo", parents=[opcoes_pagina])
     p_buscar.add_argument("titulo")
     p_buscar.add_argument("--colecao")
 
-    p_ordem_horas = sub.add_parser("ordenar-por-horas")
+    p_ordem_horas = sub.add_parser("ordenar-por-horas", parents=[opcoes_pagina])
     p_ordem_horas.add_argument("--colecao")
 
-    p_ordem_aval = sub.add_parser("ordenar-por-avaliacao")
+    p_ordem_aval = sub.add_parser("ordenar-por-avaliacao", parents=[opcoes_pagina])
     p_ordem_aval.add_argument("--colecao")
 
+    p_faixa = sub.add_parser("faixa-horas", parents=[opcoes_pagina])
+    p_faixa.add_argument("minimo", type=float)
+    p_faixa.add_argument("maximo", type=float)
+    p_faixa.add_argument("--colecao")
+
+    p_posicao = sub.add_parser("posicao-jogo")
+    p_posicao.add_argument("colecao")
+    p_posicao.add_argument("titulo")
+    p_posicao.add_argument("--por", choices=["horas", "avaliacao"], default="horas")
+    p_posicao.add_argument("--todas", action="store_true", help="Posição entre os jogos de todas as coleções")
+
     # ===== COMANDOS PARA USAR MÉTODOS ESPECIAIS DAS CLASSES JOGO =====
     p_exibir = sub.add_parser("exibir-jogo")
     p_exibir.add_argument("colecao")
@@ -260,39 +442,110 @@ def main():
     p_carregar_dados.add_argument("--arquivo", default="dados.json")
     p_carregar_dados.add_argument("--formato", default="json", choices=["json", "sqlite"])
 
+    p_exportar_csv = sub.add_parser("exportar-csv")
+    p_exportar_csv.add_argument("arquivo", help="Arquivo CSV de saída ('-' para stdout)")
+    p_exportar_csv.add_argument("--colecao")
+    p_exportar_csv.add_argument("--tamanho-bloco", type=int, default=10000)
+
+    p_importar_csv = sub.add_parser("importar-csv")
+    p_importar_csv.add_argument("arquivo")
+    p_importar_csv.add_argument("--colecao", help="Coleção de destino (ignora a coluna 'colecao' do CSV)")
+    p_importar_csv.add_argument("--tamanho-bloco", type=int, default=10000)
+
+    p_migrar = sub.add_parser("migrar-armazenamento")
+    p_migrar.add_argument("layout", choices=["unico", "fragmentado"])
+
+    # Políticas de resolução de conflitos entre cópias do mesmo jogo
+    opcoes_politica = argparse.ArgumentParser(add_help=False)
+    opcoes_politica.add_argument("--politica-status", choices=duplicados.POLITICAS_STATUS, default="mais_avancado")
+    opcoes_politica.add_argument("--politica-avaliacao", choices=duplicados.POLITICAS_AVALIACAO, default="manter")
+
+    p_dedup = sub.add_parser("deduplicar", parents=[opcoes_politica])
+    # Sem "soma": deduplicar mantém uma cópia em cada coleção, e somar as horas contaria
+    # o mesmo tempo de jogo várias vezes (e de novo a cada execução)
+    p_dedup.add_argument("--politica-horas", default="maior",
+                         choices=[p for p in duplicados.POLITICAS_HORAS if p != "soma"])
+    p_dedup.add_argument("--aplicar", action="store_true",
+                         help="Unifica as cópias (sem esta opção, só lista os jogos repetidos)")
+
+    p_mesclar = sub.add_parser("mesclar-colecoes", parents=[opcoes_politica])
+    p_mesclar.add_argument("--politica-horas", choices=duplicados.POLITICAS_HORAS, default="maior")
+    p_mesclar.add_argument("destino")
+    p_mesclar.add_argument("origens", nargs="+")
+    p_mesclar.add_argument("--remover-origens", action="store_true", help="Exclui as coleções de origem")
+
     # Faz o parse dos argumentos da linha de comando
     args = parser.parse_args()
-    
+
+    # Valida as opções de paginação dos comandos de listagem
+    if hasattr(args, "cursor"):
+        if args.limite is not None and args.limite < 1:
+            parser.error("--limite deve ser maior que zero.")
+        if args.offset < 0:
+            parser.error("--offset não pode ser negativo.")
+        if args.cursor:
+            try:
+                paginacao.decodificar_cursor(args.cursor)
+            except ValueError as e:
+                parser.error(str(e))
+
+    variavel = os.environ.get("MINHA_JOGATINA_PERFIL")
+    saida_perfil = args.perfil_saida or (variavel if variavel not in (None, "", "0", "1") else None)
+    if args.perfil or saida_perfil or variavel == "1":
+        with perfil.sessao(args.cmd, saida_perfil):
+            executar_comando(args, parser)
+    else:
+        executar_comando(args, parser)
+
+
+def executar_comando(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """
+    Executa o subcomando já interpretado pelo parser.
+
+    Separado de main() para que o comando inteiro possa rodar dentro de uma
+    sessão de perfil quando --perfil estiver ativo.
+    """
     # Carrega os dados do armazenamento
     armazenamento = carregar_armazenamento()
 
     # ===== EXECUÇÃO DO COMANDO: LISTAR COLEÇÕES =====
     if args.cmd == "listar-colecoes":
-        for c in armazenamento["collections"]:
+        for c in armazenamento.colecoes:
             print(c)
         return
 
+    # Os comandos que alteram dados rodam como transações: se outro processo gravar o
+    # arquivo entre a nossa leitura e a nossa escrita, a operação é refeita sobre os
+    # dados atuais em vez de sobrescrever a alteração do outro processo.
+    # Cada operação recebe o armazenamento e retorna a mensagem a ser exibida.
+
     # ===== EXECUÇÃO DO COMANDO: CRIAR COLEÇÃO =====
     if args.cmd == "criar-colecao":
-        # Cria uma nova entrada no dicionário de coleções com lista vazia de jogos
-        armazenamento["collections"][args.nome] = {"games": []}
-        salvar_armazenamento(armazenamento)
-        print("Coleção criada.")
+        def criar_colecao(arm: Armazenamento) -> str:
+            # Cria uma nova entrada no dicionário de coleções com lista vazia de jogos
+            arm.criar_colecao(args.nome)
+            return "Coleção criada."
+
+        print(armazenamento.transacao(criar_colecao))
         return
 
     # ===== EXECUÇÃO DO COMANDO: DELETAR COLEÇÃO =====
     if args.cmd == "deletar-colecao":
-        # Remove a coleção do dicionário (pop retorna None se não existir)
-        armazenamento["collections"].pop(args.nome, None)
-        salvar_armazenamento(armazenamento)
-        print("Coleção deletada.")
+        def deletar_colecao(arm: Armazenamento) -> str:
+            # Remove a coleção do dicionário (não faz nada se ela não existir)
+            arm.deletar_colecao(args.nome)
+            return "Coleção deletada."
+
+        print(armazenamento.transacao(deletar_colecao))
         return
 
     # ===== EXECUÇÃO DO COMANDO: LISTAR JOGOS DE UMA COLEÇÃO =====
     if args.cmd == "listar-jogos":
-        # Busca a coleção, extrai os jogos e exibe cada um
-        for g in armazenamento["collections"].get(args.colecao, {}).get("games", []):
-            print(g)
+        # Busca a coleção e recorta só a página pedida (sem percorrer o resto)
+        limite, offset, _ = _ler_paginacao(args)
+        jogos = armazenamento.jogos(args.colecao)
+        pagina = jogos[offset:] if limite is None else jogos[offset:offset + limite]
+        _exibir_pagina(args, pagina, str, offset, registro=paginacao.registro_de_dict)
         return
 
     # ===== EXECUÇÃO DO COMANDO: ADICIONAR JOGO A UMA COLEÇÃO =====
@@ -308,102 +561,268 @@ def main():
             return
 
         # Cria o objeto Jogo com validações, depois converte para dicionário
-        jogo = _jogo_para_dict(_jogo_de_dict(vars(args)))
-        # Adiciona o jogo na lista de jogos da coleção
-        armazenamento["collections"][args.colecao]["games"].append(jogo)
-        salvar_armazenamento(armazenamento)
-        print("Jogo adicionado.")
+        jogo = _jogo_para_dict(_jogo_de_dict({
+            "title": args.titulo,
+            "genero": args.genero,
+            "platform": args.plataforma,
+            "status": args.status,
+            "horas_jogadas": args.horas,
+            "avaliacao": args.avaliacao,
+        }))
+
+        def adicionar_jogo(arm: Armazenamento) -> str:
+            # Adiciona uma cópia do jogo na lista de jogos da coleção
+            arm.adicionar_jogo(args.colecao, dict(jogo))
+            return "Jogo adicionado."
+
+        print(armazenamento.transacao(adicionar_jogo))
         return
 
     # ===== EXECUÇÃO DO COMANDO: REMOVER JOGO DE UMA COLEÇÃO =====
     if args.cmd == "remover-jogo":
-        col = armazenamento["collections"][args.colecao]
-        # Filtra a lista de jogos removendo o que tem o título procurado
-        col["games"] = [g for g in col["games"] if g["title"].lower() != args.titulo.lower()]
-        salvar_armazenamento(armazenamento)
-        print("Jogo removido.")
+        def remover_jogo(arm: Armazenamento) -> str:
+            # Remove da lista de jogos o que tem o título procurado
+            arm.remover_jogo(args.colecao, args.titulo)
+            return "Jogo removido."
+
+        print(armazenamento.transacao(remover_jogo))
         return
 
     # ===== EXECUÇÃO DO COMANDO: ATUALIZAR JOGO =====
     if args.cmd == "atualizar-jogo":
-        col = armazenamento["collections"][args.colecao]
-
-        # Procura pelo jogo na coleção
-        for i, g in enumerate(col["games"]):
-            if g["title"].lower() == args.titulo.lower():
-                # Cria uma cópia do jogo para poder modificá-la
-                novo = dict(g)
-
-                # Valida que as horas não podem diminuir (apenas aumentar)
-                if args.horas is not None and args.horas < g["horas_jogadas"]:
-                    print("Horas não podem ser reduzidas.")
-                    return
-
-                # Atualiza o status se foi fornecido
-                if args.status:
-                    novo["status"] = _status_de_str(args.status).value
-
-                # Atualiza a avaliação se foi fornecida (com validações)
-                if args.avaliacao is not None:
-                    if novo["status"] != StatusJogo.FINALIZADO.value:
-                        print("Só é possível avaliar jogos finalizados.")
-                        return
-                    if not validar_avaliacao(args.avaliacao):
-                        print("Avaliação deve ser entre 0 e 10.")
-                        return
-                    novo["avaliacao"] = args.avaliacao
-
-                # Atualiza os campos opcionais se foram fornecidos
-                if args.horas is not None:
-                    novo["horas_jogadas"] = args.horas
-
-                if args.genero:
-                    novo["genero"] = args.genero
-
-                if args.plataforma:
-                    novo["platform"] = args.plataforma
-
-                if args.novo_titulo:
-                    novo["title"] = args.novo_titulo
-
-                # Reconstrói o objeto Jogo (com validações) e salva novamente
-                col["games"][i] = _jogo_para_dict(_jogo_de_dict(novo))
-                salvar_armazenamento(armazenamento)
-                print("Jogo atualizado.")
-                return
-
-        print("Jogo não encontrado.")
+        def atualizar_jogo(arm: Armazenamento) -> str:
+            # Descarta a sessão de uma tentativa anterior (que não chegou a ser gravada)
+            sessao.clear()
+
+            # Procura pelo jogo através do índice da coleção (sem copiar o dicionário)
+            g = arm.buscar_jogo(args.colecao, args.titulo)
+            if g is None:
+                return "Jogo não encontrado."
+
+            # Valida que as horas não podem diminuir (apenas aumentar)
+            if args.horas is not None and args.horas < g["horas_jogadas"]:
+                return "Horas não podem ser reduzidas."
+
+            # Monta apenas os campos que foram fornecidos
+            campos = {}
+            if args.status:
+                campos["status"] = _status_de_str(args.status)
+
+            # Valida a avaliação (se fornecida) contra o status resultante
+            if args.avaliacao is not None:
+                status_final = campos.get("status", _status_de_str(g["status"]))
+                if status_final != StatusJogo.FINALIZADO:
+                    return "Só é possível avaliar jogos finalizados."
+                if not validar_avaliacao(args.avaliacao):
+                    return "Avaliação deve ser entre 0 e 10."
+                campos["avaliacao"] = args.avaliacao
+
+            if args.horas is not None:
+                campos["horas_jogadas"] = args.horas
+
+            if args.genero:
+                campos["genero"] = args.genero
+
+            if args.plataforma:
+                campos["plataforma"] = args.plataforma
+
+            if args.novo_titulo:
+                campos["titulo"] = args.novo_titulo
+
+            # O armazenamento valida somente os campos alterados e aplica o delta no lugar
+            horas_antes = float(g["horas_jogadas"] or 0)
+            try:
+                alterados = arm.atualizar_jogo(args.colecao, args.titulo, campos)
+            except ValueError as e:
+                return str(e)
+            sessao.update(_sessao_da_alteracao(g, horas_antes, alterados))
+            return "Jogo atualizado."
+
+        # Preenchida pela tentativa que foi gravada (a operação pode ser repetida)
+        sessao: Dict[str, Any] = {}
+        print(armazenamento.transacao(atualizar_jogo))
+        if sessao:
+            sessoes.HistoricoSessoes(CAMINHO_SESSOES).registrar(
+                args.colecao, sessao["jogo"], sessao["horas"], sessao["status"])
         return
 
     # ===== EXECUÇÃO DO COMANDO: REINICIAR JOGO =====
     if args.cmd == "reiniciar-jogo":
-        col = armazenamento["collections"].get(args.colecao)
-        if not col:
-            print("Coleção não encontrada.")
+        def reiniciar_jogo(arm: Armazenamento) -> str:
+            if args.colecao not in arm.colecoes:
+                return "Coleção não encontrada."
+
+            g = arm.buscar_jogo(args.colecao, args.titulo)
+            if g is None:
+                return "Jogo não encontrado."
+
+            # Valida se pode reiniciar (não está NAO_INICIADO)
+            if _status_de_str(g["status"]) == StatusJogo.NAO_INICIADO:
+                return "Não é possível reiniciar um jogo que não foi iniciado."
+
+            # Reinicia o jogo: volta ao status JOGANDO, zera horas e remove avaliação
+            arm.atualizar_jogo(args.colecao, args.titulo, {
+                "horas_jogadas": 0.0,
+                "status": StatusJogo.JOGANDO,
+                "avaliacao": None,
+            })
+            return "Jogo reiniciado."
+
+        print(armazenamento.transacao(reiniciar_jogo))
+        return
+
+    # ===== EXECUÇÃO DO COMANDO: REGISTRAR HORAS EM LOTE =====
+    if args.cmd == "registrar-horas-lote":
+        entrada = sys.stdin if args.arquivo == "-" else open(args.arquivo, "r", encoding="utf-8")
+        atualizados = 0
+        sem_alteracao = 0
+        ignorados = 0
+        novas_sessoes = []
+        linhas_gravadas = {}
+        # As atualizações são acumuladas e gravadas uma vez por lote (commit em grupo)
+        with entrada, armazenamento.commit_em_grupo(args.intervalo, args.tamanho_lote, args.sincronizar):
+            for numero, linha in enumerate(entrada, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    colecao, titulo, horas = linha.rstrip("\n").split("\t")
+                    horas = float(horas)
+                except ValueError:
+                    print(f"Linha {numero} inválida.")
+                    ignorados += 1
+                    continue
+
+                # Os valores da linha são fixados nos parâmetros porque a operação pode
+                # ser reaplicada mais tarde, se o lote encontrar um conflito de versão
+                def registrar_horas(arm: Armazenamento, colecao=colecao, titulo=titulo, horas=horas):
+                    g = arm.buscar_jogo(colecao, titulo)
+                    if g is None:
+                        return "Jogo não encontrado."
+                    # Mesma regra de atualizar-jogo: as horas não podem diminuir
+                    if horas < g["horas_jogadas"]:
+                        return "Horas não podem ser reduzidas."
+                    horas_antes = float(g["horas_jogadas"] or 0)
+                    try:
+                        alterados = arm.atualizar_jogo(colecao, titulo, {"horas_jogadas": horas})
+                    except ValueError as e:
+                        return str(e)
+                    if not alterados:
+                        # Horas iguais às registradas: nada a gravar (a operação não entra no lote)
+                        return None
+                    return _sessao_da_alteracao(g, horas_antes, alterados)
+
+                resultado = armazenamento.transacao(registrar_horas)
+                if isinstance(resultado, str):
+                    print(f"Linha {numero}: {resultado}")
+                    ignorados += 1
+                elif resultado is None:
+                    print(f"Linha {numero}: sem alteração (horas iguais às registradas).")
+                    sem_alteracao += 1
+                else:
+                    # Contada só depois de gravada: ao reaplicar o lote, o resultado pode mudar
+                    linhas_gravadas[registrar_horas] = (numero, colecao)
+
+        for operacao, resultado in armazenamento.resultados_grupo:
+            numero, colecao = linhas_gravadas[operacao]
+            if isinstance(resultado, str):
+                print(f"Linha {numero}: {resultado} (a alteração deixou de valer ao reaplicar o lote)")
+                ignorados += 1
+            elif resultado is None:
+                print(f"Linha {numero}: sem alteração ao reaplicar o lote (horas iguais às registradas).")
+                sem_alteracao += 1
+            else:
+                atualizados += 1
+                if resultado:
+                    novas_sessoes.append(sessoes.nova_sessao(colecao, resultado["jogo"], resultado["horas"]))
+
+        # As sessões do lote entram no histórico com uma única gravação
+        sessoes.HistoricoSessoes(CAMINHO_SESSOES).registrar_varias(novas_sessoes)
+
+        print(f"Jogos atualizados: {atualizados} (sem alteração: {sem_alteracao}, ignorados: {ignorados})")
+        if args.metricas:
+            for nome, valor in armazenamento.metricas_gravacao().items():
+                print(f"{nome}: {valor:.2f}" if isinstance(valor, float) else f"{nome}: {valor}")
+        return
+
+    # ===== HISTÓRICO DE SESSÕES =====
+    # As sessões ficam em um registro só de inclusão; totais por dia/semana/mês/ano e
+    # por gênero são mantidos a cada sessão, então as consultas não releem o registro.
+
+    # --- COMANDO: Registrar uma sessão (soma as horas ao jogo e guarda no histórico) ---
+    if args.cmd == "registrar-sessao":
+        if args.horas < 0:
+            print("Horas jogadas não podem ser negativas.")
+            return
+
+        def registrar_sessao(arm: Armazenamento):
+            if args.colecao not in arm.colecoes:
+                return "Coleção não encontrada."
+            g = arm.buscar_jogo(args.colecao, args.titulo)
+            if g is None:
+                return "Jogo não encontrado."
+            horas_antes = float(g["horas_jogadas"] or 0)
+            campos: Dict[str, Any] = {"horas_jogadas": horas_antes + args.horas}
+            if args.status:
+                campos["status"] = _status_de_str(args.status)
+            try:
+                alterados = arm.atualizar_jogo(args.colecao, args.titulo, campos)
+            except ValueError as e:
+                return str(e)
+            return _sessao_da_alteracao(g, horas_antes, alterados)
+
+        resultado = armazenamento.transacao(registrar_sessao)
+        if isinstance(resultado, str):
+            print(resultado)
+            return
+        if not resultado:
+            print("Nada a registrar.")
             return
+        sessoes.HistoricoSessoes(CAMINHO_SESSOES).registrar(
+            args.colecao, resultado["jogo"], resultado["horas"], resultado["status"])
+        print("Sessão registrada.")
+        return
 
-        for i, g in enumerate(col["games"]):
-            if g["title"].lower() == args.titulo.lower():
-                # Reconstrói o objeto Jogo a partir do dicionário
-                jogo_obj = _jogo_de_dict(g)
-                
-                # Valida se pode reiniciar (não está NAO_INICIADO)
-                if jogo_obj.status == StatusJogo.NAO_INICIADO:
-                    print("Não é possível reiniciar um jogo que não foi iniciado.")
-                    return
-
-                # Reinicia o jogo: volta ao status JOGANDO, zera horas e remove avaliação
-                jogo_obj._horas_jogadas = 0.0
-                jogo_obj._status = StatusJogo.JOGANDO
-                jogo_obj._avaliacao = None
-
-                # Salva o jogo reiniciado
-                col["games"][i] = _jogo_para_dict(jogo_obj)
-                salvar_armazenamento(armazenamento)
-                print("Jogo reiniciado.")
-                return
+    # --- COMANDO: Listar as sessões de um intervalo de datas ---
+    if args.cmd == "historico":
+        historico = sessoes.HistoricoSessoes(CAMINHO_SESSOES)
+        encontradas = (r for r in historico.percorrer(args.de, args.ate)
+                       if not args.colecao or r["colecao"] == args.colecao)
+        for registro in islice(encontradas, args.limite):
+            quando = datetime.fromtimestamp(registro["instante"]).strftime("%Y-%m-%d %H:%M")
+            status = f" -> {registro['status']}" if registro["status"] else ""
+            print(f"{quando}  {registro['titulo']} ({registro['colecao']}): +{registro['horas']:g}h{status}")
+        return
 
-        print("Jogo não encontrado.")
+    # --- RELATÓRIO: Horas jogadas por dia, semana, mês, ano ou gênero ---
+    if args.cmd == "horas-por-periodo":
+        historico = sessoes.HistoricoSessoes(CAMINHO_SESSOES)
+        if args.por == "genero":
+            totais = list(historico.totais_por_genero(args.de, args.ate).items())
+        else:
+            totais = historico.totais(args.por, args.de, args.ate)
+        for chave, total in totais:
+            print(f"{chave or '(sem gênero)'}: {total['horas']:.1f}h "
+                  f"({total['sessoes']} sessões, {total['finalizados']} finalizados)")
+        return
+
+    # --- RELATÓRIO: Progresso da meta anual de jogos finalizados (configuracao.json) ---
+    if args.cmd == "meta-anual":
+        meta = carregar_configuracao().get("meta_anual_jogos_finalizados")
+        if not meta:
+            print("Nenhuma meta anual definida em configuracao.json.")
+            return
+        hoje = date.today()
+        ano = args.ano or hoje.year
+        total = sessoes.HistoricoSessoes(CAMINHO_SESSOES).total("ano", str(ano))
+        print(f"Meta de {ano}: {total['finalizados']} de {meta} jogos finalizados "
+              f"({100 * total['finalizados'] / meta:.1f}%)")
+        print(f"Horas jogadas em {ano}: {total['horas']:.1f}h em {total['sessoes']} sessões")
+        if ano == hoje.year:
+            # Quantos jogos já deveriam estar finalizados com um ritmo constante ao longo do ano
+            dias_no_ano = (date(ano + 1, 1, 1) - date(ano, 1, 1)).days
+            esperado = meta * hoje.timetuple().tm_yday / dias_no_ano
+            ritmo = "dentro do ritmo" if total["finalizados"] >= esperado else "abaixo do ritmo"
+            print(f"Esperado até hoje: {esperado:.1f} ({ritmo})")
         return
 
     # ===== COMANDOS DE RELATÓRIOS =====
@@ -445,59 +864,113 @@ def main():
             print(f"{jogo.titulo} - {jogo.horas_jogadas}h")
         return
 
+    # --- RELATÓRIO: Estatísticas (medianas, p90, histograma de horas, por gênero/plataforma) ---
+    if args.cmd == "estatisticas":
+        # Cada coleção é resumida em uma passada e os resumos são mesclados; resumos já
+        # guardados são reaproveitados, e só com --guardar os novos são gravados
+        if args.guardar:
+            estat = armazenamento.transacao(lambda arm: arm.resumo_estatistico(args.colecao, guardar=True))
+        else:
+            estat = armazenamento.resumo_estatistico(args.colecao)
+        grupos = {"genero": estat.por_genero, "plataforma": estat.por_plataforma}.get(args.por, {})
+        if args.formato == "json":
+            print(json.dumps({"geral": estat.geral.relatorio(),
+                              "grupos": {nome: r.relatorio() for nome, r in sorted(grupos.items())}},
+                             ensure_ascii=False, indent=2))
+            return
+        _exibir_estatisticas(estat.geral.relatorio())
+        for nome, resumo in sorted(grupos.items()):
+            r = resumo.relatorio()
+            print(f"  {nome or '(sem ' + args.por + ')'}: {r['jogos']} jogos, {r['horas_total']:.1f}h, "
+                  f"horas mediana {_valor(r['horas']['mediana'])}, "
+                  f"avaliação mediana {_valor(r['avaliacao']['mediana'])} / p90 {_valor(r['avaliacao']['p90'])}")
+        return
+
+    # Os comandos de listagem abaixo aceitam --limite/--offset/--cursor e --formato.
+    # Os jogos são reconstruídos sob demanda e a paginação é feita dentro do Relatorio,
+    # então um filtro com --limite para de percorrer o catálogo ao completar a página
+    # e uma ordenação com --limite seleciona só os primeiros itens, sem ordenar tudo.
+
     # --- RELATÓRIO: Filtrar por gênero ---
     if args.cmd == "filtrar-por-genero":
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        filtrados = relatorio.filtrar_por_genero(args.genero)
-        for jogo in filtrados:
-            print(f"{jogo.titulo} ({jogo.genero})")
+        limite, offset, _ = _ler_paginacao(args)
+        relatorio = Relatorio(_iterar_jogos_de_armazenamento(armazenamento, args.colecao))
+        filtrados = relatorio.filtrar_por_genero(args.genero, limite, offset)
+        _exibir_pagina(args, filtrados, lambda jogo: f"{jogo.titulo} ({jogo.genero})", offset)
         return
 
     # --- RELATÓRIO: Filtrar por plataforma ---
     if args.cmd == "filtrar-por-plataforma":
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        filtrados = relatorio.filtrar_por_plataforma(args.plataforma)
-        for jogo in filtrados:
-            print(f"{jogo.titulo} ({jogo.plataforma})")
+        limite, offset, _ = _ler_paginacao(args)
+        relatorio = Relatorio(_iterar_jogos_de_armazenamento(armazenamento, args.colecao))
+        filtrados = relatorio.filtrar_por_plataforma(args.plataforma, limite, offset)
+        _exibir_pagina(args, filtrados, lambda jogo: f"{jogo.titulo} ({jogo.plataforma})", offset)
         return
 
     # --- RELATÓRIO: Filtrar por status ---
     if args.cmd == "filtrar-por-status":
         status_obj = _status_de_str(args.status)
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        filtrados = relatorio.filtrar_por_status(status_obj)
-        for jogo in filtrados:
-            print(f"{jogo.titulo} ({jogo.status.value})")
+        limite, offset, _ = _ler_paginacao(args)
+        relatorio = Relatorio(_iterar_jogos_de_armazenamento(armazenamento, args.colecao))
+        filtrados = relatorio.filtrar_por_status(status_obj, limite, offset)
+        _exibir_pagina(args, filtrados, lambda jogo: f"{jogo.titulo} ({jogo.status.value})", offset)
         return
 
     # --- RELATÓRIO: Buscar por título (substring) ---
     if args.cmd == "buscar-por-titulo":
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        encontrados = relatorio.buscar_por_titulo(args.titulo)
-        for jogo in encontrados:
-            print(f"{jogo.titulo}")
+        limite, offset, _ = _ler_paginacao(args)
+        relatorio = Relatorio(_iterar_jogos_de_armazenamento(armazenamento, args.colecao))
+        encontrados = relatorio.buscar_por_titulo(args.titulo, limite, offset)
+        _exibir_pagina(args, encontrados, lambda jogo: f"{jogo.titulo}", offset)
         return
 
+    # As ordenações, faixas e posições são só leituras: cada consulta faz uma passada
+    # pelos jogos e, com --limite, seleciona só os offset + limite primeiros (heap).
+
     # --- RELATÓRIO: Ordenar por horas jogadas ---
     if args.cmd == "ordenar-por-horas":
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        ordenados = relatorio.ordenar_por_horas()
-        for jogo in ordenados:
-            print(f"{jogo.titulo} - {jogo.horas_jogadas}h")
+        limite, offset, apos = _ler_paginacao(args)
+        fim = offset + limite if limite is not None else None
+        ordenados, chaves = _pagina_ordenada(armazenamento.ranking("horas", args.colecao, apos, fim), offset)
+        _exibir_pagina(args, ordenados, lambda jogo: f"{jogo.titulo} - {jogo.horas_jogadas}h", offset,
+                       chaves=chaves)
         return
 
     # --- RELATÓRIO: Ordenar por avaliação ---
     if args.cmd == "ordenar-por-avaliacao":
-        jogos = _construir_jogos_de_armazenamento(armazenamento, args.colecao if hasattr(args, 'colecao') and args.colecao else None)
-        relatorio = Relatorio(jogos)
-        ordenados = relatorio.ordenar_por_avaliacao()
-        for jogo in ordenados:
-            print(f"{jogo.titulo} - nota {jogo.avaliacao}")
+        limite, offset, apos = _ler_paginacao(args)
+        fim = offset + limite if limite is not None else None
+        ordenados, chaves = _pagina_ordenada(armazenamento.ranking("avaliacao", args.colecao, apos, fim),
+                                             offset)
+        _exibir_pagina(args, ordenados, lambda jogo: f"{jogo.titulo} - nota {jogo.avaliacao}", offset,
+                       chaves=chaves)
+        return
+
+    # --- RELATÓRIO: Jogos com horas jogadas entre MIN e MAX (mais jogados primeiro) ---
+    if args.cmd == "faixa-horas":
+        limite, offset, apos = _ler_paginacao(args)
+        fim = offset + limite if limite is not None else None
+        jogos = armazenamento.faixa("horas", args.minimo, args.maximo, args.colecao, apos, fim)
+        ordenados, chaves = _pagina_ordenada(jogos, offset)
+        _exibir_pagina(args, ordenados, lambda jogo: f"{jogo.titulo} - {jogo.horas_jogadas}h", offset,
+                       chaves=chaves)
+        return
+
+    # --- RELATÓRIO: Posição de um jogo no ranking de horas ou de avaliação ---
+    if args.cmd == "posicao-jogo":
+        if args.colecao not in armazenamento.colecoes:
+            print("Coleção não encontrada.")
+            return
+        resultado = armazenamento.posicao(args.por, args.colecao, args.titulo, args.todas)
+        if resultado is None:
+            if armazenamento.buscar_jogo(args.colecao, args.titulo) is None:
+                print("Jogo não encontrado.")
+            else:
+                print("Jogo sem avaliação.")
+            return
+        posicao, total = resultado
+        onde = "em todas as coleções" if args.todas else f"na coleção {args.colecao}"
+        print(f"{args.titulo}: {posicao}º de {total} por {args.por} {onde}")
         return
 
     # ===== COMANDOS DE PERSISTÊNCIA DE DADOS =====
@@ -522,46 +995,176 @@ def main():
             print(f"  - {jogo.titulo} ({jogo.plataforma})")
         return
 
+    # --- COMANDO: Exportar jogos para CSV (em blocos, sem montar a lista completa) ---
+    if args.cmd == "exportar-csv":
+        saida = nullcontext(sys.stdout) if args.arquivo == "-" else open(args.arquivo, "w", newline="", encoding="utf-8")
+        with saida as f:
+            total = csv_jogos.escrever_em_blocos(f, armazenamento.percorrer_jogos(args.colecao), args.tamanho_bloco)
+        perfil.contar(registros=total)
+        if args.arquivo != "-":
+            print(f"{total} jogos exportados para {args.arquivo}.")
+        return
+
+    # --- COMANDO: Importar jogos de CSV (em blocos, validando cada linha) ---
+    if args.cmd == "importar-csv":
+        # Só as primeiras mensagens de erro são guardadas, para a memória não crescer com o arquivo
+        max_erros = 20
+
+        def importar_csv(arm: Armazenamento) -> dict:
+            resultado = {"importados": 0, "duplicados": 0, "invalidos": 0, "erros": []}
+
+            def invalido(numero: int, mensagem: str):
+                resultado["invalidos"] += 1
+                if len(resultado["erros"]) < max_erros:
+                    resultado["erros"].append(f"Linha {numero}: {mensagem}")
+
+            with open(args.arquivo, "r", newline="", encoding="utf-8") as f:
+                for bloco in csv_jogos.ler_em_blocos(f, args.tamanho_bloco):
+                    for numero, linha in bloco:
+                        colecao = args.colecao or linha.get("colecao")
+                        if not colecao:
+                            invalido(numero, "coleção não informada.")
+                            continue
+                        try:
+                            jogo = csv_jogos.linha_para_jogo(linha)
+                        except ValueError as e:
+                            invalido(numero, str(e))
+                            continue
+                        if colecao not in arm.colecoes:
+                            arm.criar_colecao(colecao)
+                        # Jogos com o mesmo título já presentes na coleção são ignorados
+                        if arm.buscar_jogo(colecao, jogo["title"]) is not None:
+                            resultado["duplicados"] += 1
+                            continue
+                        arm.adicionar_jogo(colecao, jogo)
+                        resultado["importados"] += 1
+            return resultado
+
+        # Se houver conflito de versão, o arquivo é relido e a importação refeita
+        resultado = armazenamento.transacao(importar_csv)
+        perfil.contar(registros=resultado["importados"])
+        for erro in resultado["erros"]:
+            print(erro)
+        print(f"Jogos importados: {resultado['importados']} "
+              f"(duplicados: {resultado['duplicados']}, inválidos: {resultado['invalidos']})")
+        return
+
+    # --- COMANDO: Migrar entre arquivo único e um arquivo por coleção ---
+    if args.cmd == "migrar-armazenamento":
+        if args.layout == "fragmentado":
+            classe, caminho = ArmazenamentoFragmentado, CAMINHO_MANIFESTO
+        else:
+            classe, caminho = Armazenamento, CAMINHO_ARMAZENAMENTO
+        if type(armazenamento) is classe:
+            print("O armazenamento já usa esse layout.")
+            return
+
+        def copiar_colecoes(destino: Armazenamento) -> None:
+            for nome in list(destino.colecoes):
+                destino.deletar_colecao(nome)
+            for nome, col in armazenamento.colecoes.items():
+                destino.criar_colecao(nome)
+                for g in col.get("games", []):
+                    destino.adicionar_jogo(nome, g)
+
+        # A origem fica travada da leitura até a troca pelo backup: uma gravação de
+        # outro processo nesse meio-tempo seria perdida na migração
+        with armazenamento.travado():
+            armazenamento.recarregar()
+            destino = classe.carregar(caminho)
+            destino.transacao(copiar_colecoes)
+            if not os.path.exists(caminho):
+                # Sem coleções não há alteração a gravar, mas o novo layout precisa existir
+                destino.salvar()
+            # O arquivo antigo é mantido como backup (e deixa de ser usado)
+            if os.path.exists(armazenamento.caminho):
+                os.replace(armazenamento.caminho, armazenamento.caminho + ".bak")
+        print(f"Armazenamento migrado para {caminho}.")
+        return
+
+    # --- COMANDO: Encontrar (e unificar) jogos repetidos entre coleções ---
+    if args.cmd == "deduplicar":
+        politica = duplicados.Politica(args.politica_horas, args.politica_status, args.politica_avaliacao)
+        if not args.aplicar:
+            # Uma passada pelo catálogo agrupando pela chave (título, plataforma)
+            grupos = duplicados.duplicados(armazenamento.percorrer_jogos())
+            for grupo in grupos.values():
+                _, primeiro = grupo[0]
+                colecoes = ", ".join(dict.fromkeys(colecao for colecao, _ in grupo))
+                print(f"{primeiro['title']} ({primeiro.get('platform')}): {len(grupo)} cópias em {colecoes}")
+            print(f"Jogos repetidos: {len(grupos)}")
+            return
+
+        def deduplicar(arm: Armazenamento) -> str:
+            resultado = duplicados.deduplicar(arm, politica)
+            return (f"Jogos repetidos: {resultado['grupos']} (coleções alteradas: {resultado['colecoes']}, "
+                    f"cópias removidas: {resultado['removidos']})")
+
+        try:
+            # Todas as coleções alteradas são gravadas juntas, em uma única transação
+            print(armazenamento.transacao(deduplicar))
+        except ValueError as e:
+            print(f"Nada foi alterado. Conflito sem solução para a política escolhida: {e}")
+        return
+
+    # --- COMANDO: Juntar coleções em uma só ---
+    if args.cmd == "mesclar-colecoes":
+        politica = duplicados.Politica(args.politica_horas, args.politica_status, args.politica_avaliacao)
+
+        def mesclar_colecoes(arm: Armazenamento) -> str:
+            resultado = duplicados.mesclar_colecoes(arm, args.origens, args.destino, politica,
+                                                    args.remover_origens)
+            return (f"Coleção '{args.destino}' com {resultado['jogos']} jogos "
+                    f"(repetidos unificados: {resultado['duplicados']})")
+
+        try:
+            print(armazenamento.transacao(mesclar_colecoes))
+        except KeyError as e:
+            print(f"Coleção não encontrada: {e.args[0]}")
+        except ValueError as e:
+            print(f"Nada foi alterado. Conflito sem solução para a política escolhida: {e}")
+        return
+
     # ===== COMANDOS PARA USAR MÉTODOS ESPECIAIS DAS CLASSES JOGO =====
     # Estes comandos demonstram o uso dos métodos especiais (__str__, __repr__, __eq__, __lt__)
 
     # --- COMANDO: Exibir jogo (usa __str__()) ---
     if args.cmd == "exibir-jogo":
-        col = armazenamento["collections"].get(args.colecao)
+        col = armazenamento.colecoes.get(args.colecao)
         if not col:
             print("Coleção não encontrada.")
             return
 
-        for g_dict in col["games"]:
-            if g_dict["title"].lower() == args.titulo.lower():
-                jogo_obj = _jogo_de_dict(g_dict)
-                # __str__() retorna: "{titulo} ({plataforma}) - {status}"
-                print(jogo_obj)
-                return
+        g_dict = armazenamento.buscar_jogo(args.colecao, args.titulo)
+        if g_dict is not None:
+            jogo_obj = _jogo_de_dict(g_dict)
+            # __str__() retorna: "{titulo} ({plataforma}) - {status}"
+            print(jogo_obj)
+            return
 
         print("Jogo não encontrado.")
         return
 
     # --- COMANDO: Exibir jogo com detalhes (usa __repr__()) ---
     if args.cmd == "exibir-jogo-detalhes":
-        col = armazenamento["collections"].get(args.colecao)
+        col = armazenamento.colecoes.get(args.colecao)
         if not col:
             print("Coleção não encontrada.")
             return
 
-        for g_dict in col["games"]:
-            if g_dict["title"].lower() == args.titulo.lower():
-                jogo_obj = _jogo_de_dict(g_dict)
-                # __repr__() retorna representação detalhada: Jogo(titulo='...', plataforma='...', status='...', horas=...)
-                print(repr(jogo_obj))
-                return
+        g_dict = armazenamento.buscar_jogo(args.colecao, args.titulo)
+        if g_dict is not None:
+            jogo_obj = _jogo_de_dict(g_dict)
+            # __repr__() retorna representação detalhada: Jogo(titulo='...', plataforma='...', status='...', horas=...)
+            print(repr(jogo_obj))
+            return
 
         print("Jogo não encontrado.")
         return
 
     # --- COMANDO: Comparar dois jogos (usa __eq__() e __lt__()) ---
     if args.cmd == "comparar-jogos":
-        col = armazenamento["collections"].get(args.colecao)
+        col = armazenamento.colecoes.get(args.colecao)
         if not col:
             print("Coleção não encontrada.")
             return
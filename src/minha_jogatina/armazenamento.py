@@ -0,0 +1,804 @@
+"""
+Camada de armazenamento das coleções de jogos usada pela CLI.
+
+O arquivo JSON guarda as coleções no formato:
+    {"collections": {"<nome>": {"games": [{"title": ..., "platform": ..., ...}]}}}
+
+Esta classe mantém um índice por coleção (título em minúsculas -> posição na lista)
+para que buscas e atualizações não precisem percorrer a coleção inteira. Rankings
+por horas e por avaliação usam listas já ordenadas (ver o módulo indices) quando
+elas foram construídas em memória, mantidas a cada alteração; sem elas, cada
+consulta faz uma passada e seleciona só os itens pedidos.
+Também pode guardar o resumo estatístico de cada coleção (módulo estatisticas),
+descartado quando a coleção muda e recalculado na próxima consulta.
+
+Vários processos podem usar o mesmo arquivo ao mesmo tempo: leituras usam uma trava
+compartilhada e escritas uma trava exclusiva (no arquivo "<caminho>.lock"). Cada
+gravação incrementa o campo "versao"; se outro processo gravou depois da nossa
+leitura, a gravação falha com ConflitoDeVersao e transacao() repete a operação
+sobre os dados atualizados.
+
+Com ArmazenamentoFragmentado, cada coleção fica em seu próprio arquivo e um pequeno
+manifesto guarda a lista de coleções e a versão; só as coleções usadas são lidas e
+só as alteradas são regravadas.
+
+Para rajadas de alterações (ex.: scripts que registram horas de muitos jogos), o
+modo commit_em_grupo() acumula as transações e grava uma única vez por lote.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import random
+import re
+import time
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem travas consultivas, apenas o controle de versão
+    fcntl = None
+
+from . import indices, perfil
+from .estatisticas import Estatisticas, resumir
+from .models.status import StatusJogo
+
+T = TypeVar("T")
+
+# Nome do campo no objeto Jogo -> chave usada no arquivo JSON
+CHAVES_JSON = {
+    "titulo": "title",
+    "genero": "genero",
+    "plataforma": "platform",
+    "status": "status",
+    "horas_jogadas": "horas_jogadas",
+    "avaliacao": "avaliacao",
+}
+
+
+def validar_campos(atual: Dict[str, Any], alterados: Dict[str, Any]) -> None:
+    """
+    Aplica as regras de negócio de Jogo apenas ao que foi alterado.
+
+    `atual` é o dicionário JSON do jogo e `alterados` contém somente as chaves JSON
+    que vão mudar. Uma regra só é verificada se algum dos campos de que ela depende
+    mudou, evitando reconstruir o objeto Jogo inteiro a cada atualização.
+    Lança ValueError com as mesmas mensagens das properties de Jogo.
+    """
+    def valor(chave):
+        return alterados[chave] if chave in alterados else atual.get(chave)
+
+    if "title" in alterados:
+        titulo = alterados["title"]
+        if not titulo or not titulo.strip():
+            raise ValueError("O título do jogo não pode ser vazio.")
+
+    if "horas_jogadas" in alterados and alterados["horas_jogadas"] < 0:
+        raise ValueError("Horas jogadas não podem ser negativas.")
+
+    finalizado = valor("status") == StatusJogo.FINALIZADO.value
+    if ("status" in alterados or "horas_jogadas" in alterados) and finalizado:
+        if float(valor("horas_jogadas") or 0) < 1.0:
+            raise ValueError("Não é possível finalizar um jogo com menos de 1h jogada.")
+
+    if ("status" in alterados or "avaliacao" in alterados) and valor("avaliacao") is not None:
+        if not finalizado:
+            raise ValueError("O jogo só pode receber avaliação após ser marcado como 'FINALIZADO'.")
+        if not (0 <= alterados.get("avaliacao", 0) <= 10):
+            raise ValueError("A avaliação deve ser entre 0 e 10.")
+
+
+class ConflitoDeVersao(Exception):
+    """O arquivo foi gravado por outro processo depois da nossa leitura."""
+
+
+# Arquivos cuja trava exclusiva é mantida com Armazenamento.travado() -> pid do processo
+# que a mantém (um processo filho criado com fork herda o dicionário, mas não a trava)
+_travas_mantidas: Dict[str, int] = {}
+
+
+@contextmanager
+def _travar(caminho: str, exclusiva: bool):
+    """Trava consultiva (flock) sobre o arquivo de trava do armazenamento."""
+    if fcntl is None or _travas_mantidas.get(caminho) == os.getpid():
+        # Dentro de travado() a trava exclusiva já está com este processo
+        yield
+        return
+    with open(caminho + ".lock", "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusiva else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _assinatura(caminho: str) -> Optional[Tuple[int, int, int]]:
+    """Identifica o conteúdo atual do arquivo sem lê-lo (None se não existir)."""
+    try:
+        st = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _ler_json(caminho: str) -> Any:
+    with perfil.fase("json.load"), open(caminho, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    if perfil.ativo():
+        perfil.contar(bytes_lidos=os.path.getsize(caminho))
+    return dados
+
+
+def _gravar_json(caminho: str, dados: Any, sincronizar: bool) -> None:
+    """Grava em um arquivo temporário e substitui o original (troca atômica)."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        with perfil.fase("json.dump"):
+            json.dump(dados, f, indent=2, ensure_ascii=False)
+        if sincronizar:
+            with perfil.fase("fsync"):
+                f.flush()
+                os.fsync(f.fileno())
+        if perfil.ativo():
+            perfil.contar(bytes_gravados=f.tell())
+    os.replace(temporario, caminho)
+
+
+class Armazenamento:
+    def __init__(self, caminho: str, dados: Optional[Dict[str, Any]] = None, sincronizar: bool = False):
+        self.caminho = caminho
+        # Se True, cada gravação faz fsync antes de substituir o arquivo
+        self.sincronizar = sincronizar
+        self.dados: Dict[str, Any] = dados if dados is not None else {"collections": {}}
+        # Índices por coleção, construídos sob demanda: título.lower() -> posição
+        self._indices: Dict[str, Dict[str, int]] = {}
+        # Índices ordenados por coleção (módulo indices), também construídos sob demanda
+        self._ordenados: Dict[str, Dict[str, Any]] = {}
+        # Coleções alteradas desde a última gravação e contador de alterações
+        self._colecoes_sujas: Set[str] = set()
+        self._mutacoes = 0
+        self._assinatura_lida: Optional[Tuple[int, int, int]] = None
+        # Estado do modo commit_em_grupo() (None quando desativado)
+        self._grupo: Optional[Dict[str, Any]] = None
+        # Pares (operação, resultado final) das operações gravadas pelo último commit_em_grupo()
+        self.resultados_grupo: List[Tuple[Callable[["Armazenamento"], Any], Any]] = []
+        self._metricas = {
+            "descargas": 0,
+            "operacoes": 0,
+            "conflitos": 0,
+            "divergencias": 0,
+            "lote_ultimo": 0,
+            "lote_max": 0,
+            "latencia_ultima_ms": 0.0,
+            "latencia_max_ms": 0.0,
+            "latencia_total_ms": 0.0,
+        }
+
+    @classmethod
+    def carregar(cls, caminho: str, sincronizar: bool = False) -> "Armazenamento":
+        """Lê o arquivo JSON (ou cria a estrutura padrão se ele não existir)."""
+        armazenamento = cls(caminho, sincronizar=sincronizar)
+        armazenamento.recarregar()
+        return armazenamento
+
+    def recarregar(self) -> None:
+        """Relê o arquivo sob trava compartilhada, descartando alterações não salvas."""
+        with perfil.fase("armazenamento.carregar"), _travar(self.caminho, exclusiva=False):
+            self._assinatura_lida = _assinatura(self.caminho)
+            if self._assinatura_lida is None:
+                self.dados = {"collections": {}}
+            else:
+                self.dados = _ler_json(self.caminho)
+        self._indices = {}
+        self._ordenados = {}
+        self._colecoes_sujas = set()
+
+    @contextmanager
+    def travado(self) -> Iterator["Armazenamento"]:
+        """
+        Mantém a trava exclusiva do arquivo durante todo o bloco.
+
+        Outros processos não leem nem gravam enquanto o bloco roda; as leituras e
+        gravações deste processo dentro dele reaproveitam a trava. Serve para
+        operações que leem e depois substituem o arquivo inteiro (ex.: migração
+        de layout) sem perder gravações feitas entre os dois passos.
+        """
+        with _travar(self.caminho, exclusiva=True):
+            _travas_mantidas[self.caminho] = os.getpid()
+            try:
+                yield self
+            finally:
+                _travas_mantidas.pop(self.caminho, None)
+
+    @property
+    def versao(self) -> int:
+        return self.dados.get("versao", 0)
+
+    def _versao_em_disco(self) -> int:
+        # Se o arquivo não mudou desde a leitura, a versão é a mesma que temos em memória
+        assinatura = _assinatura(self.caminho)
+        if assinatura == self._assinatura_lida:
+            return self.versao
+        if assinatura is None:
+            return 0
+        return _ler_json(self.caminho).get("versao", 0)
+
+    def salvar(self) -> None:
+        """
+        Persiste todas as coleções no arquivo JSON.
+
+        A gravação é feita sob trava exclusiva em um arquivo temporário que depois
+        substitui o original, então leitores nunca veem um arquivo pela metade.
+        Lança ConflitoDeVersao se outro processo gravou desde a última leitura.
+        """
+        with perfil.fase("armazenamento.salvar"), _travar(self.caminho, exclusiva=True):
+            if self._versao_em_disco() != self.versao:
+                raise ConflitoDeVersao(self.caminho)
+            self.dados["versao"] = self.versao + 1
+            self._gravar_arquivos()
+            self._assinatura_lida = _assinatura(self.caminho)
+        self._colecoes_sujas = set()
+
+    def _gravar_arquivos(self) -> None:
+        # Chamado por salvar() já com a trava exclusiva e a versão incrementada
+        _gravar_json(self.caminho, self.dados, self.sincronizar)
+
+    def transacao(self, operacao: Callable[["Armazenamento"], T], tentativas: int = 50) -> T:
+        """
+        Executa operacao(self) e salva, repetindo em caso de conflito de versão.
+
+        A operação deve ler e alterar os dados apenas através do armazenamento
+        recebido, pois a cada nova tentativa ele é recarregado do disco. Se a
+        operação não alterar nada, nada é gravado. Dentro de commit_em_grupo()
+        a gravação é adiada até o lote ser descarregado.
+        """
+        for tentativa in range(tentativas):
+            antes = self._mutacoes
+            resultado = operacao(self)
+            if self._mutacoes == antes:
+                return resultado
+            if self._grupo is not None:
+                self._enfileirar(operacao, resultado)
+                return resultado
+            try:
+                self.salvar()
+                return resultado
+            except ConflitoDeVersao:
+                self._aguardar_nova_tentativa(tentativa)
+                self.recarregar()
+        raise ConflitoDeVersao(self.caminho)
+
+    @staticmethod
+    def _aguardar_nova_tentativa(tentativa: int) -> None:
+        # Espera um pouco (com variação aleatória) para não colidir de novo
+        time.sleep(random.uniform(0, 0.002 * (tentativa + 1)))
+
+    # ===== COMMIT EM GRUPO =====
+
+    @contextmanager
+    def commit_em_grupo(self, intervalo: float = 1.0, tamanho_lote: int = 100,
+                        sincronizar: Optional[bool] = None) -> Iterator["Armazenamento"]:
+        """
+        Acumula as transações e grava uma vez por lote.
+
+        O lote é descarregado quando atinge `tamanho_lote` operações, quando uma
+        nova operação chega depois de `intervalo` segundos desde a primeira do lote,
+        ou ao sair do bloco. `sincronizar` substitui a opção de fsync do armazenamento
+        durante o bloco (um fsync por lote em vez de um por alteração).
+
+        Dentro do bloco, transacao() retorna o resultado da primeira execução da
+        operação. Se um lote precisar ser reaplicado por conflito de versão, o
+        resultado pode mudar (ex.: a alteração deixou de ser válida); os resultados
+        finais de todas as operações gravadas ficam em `resultados_grupo`.
+        """
+        sincronizar_anterior = self.sincronizar
+        if sincronizar is not None:
+            self.sincronizar = sincronizar
+        self._grupo = {
+            "intervalo": intervalo,
+            "tamanho_lote": tamanho_lote,
+            "operacoes": [],
+            "resultados": [],
+            "inicio": 0.0,
+        }
+        self.resultados_grupo = []
+        try:
+            yield self
+        finally:
+            try:
+                self.descarregar()
+            finally:
+                self._grupo = None
+                self.sincronizar = sincronizar_anterior
+
+    def _enfileirar(self, operacao: Callable[["Armazenamento"], Any], resultado: Any) -> None:
+        grupo = self._grupo
+        if not grupo["operacoes"]:
+            grupo["inicio"] = time.monotonic()
+        grupo["operacoes"].append(operacao)
+        grupo["resultados"].append(resultado)
+        if (len(grupo["operacoes"]) >= grupo["tamanho_lote"]
+                or time.monotonic() - grupo["inicio"] >= grupo["intervalo"]):
+            self.descarregar()
+
+    def descarregar(self, tentativas: int = 50) -> None:
+        """
+        Grava o lote acumulado por commit_em_grupo().
+
+        Em caso de conflito de versão, recarrega o arquivo e reaplica todas as
+        operações do lote antes de tentar de novo. Os resultados da reaplicação
+        substituem os da primeira execução em `resultados_grupo`, e as operações
+        cujo resultado mudou são contadas em "divergencias".
+        """
+        if self._grupo is None or not self._grupo["operacoes"]:
+            return
+        operacoes = self._grupo["operacoes"]
+        originais = resultados = self._grupo["resultados"]
+        inicio = time.perf_counter()
+        for tentativa in range(tentativas):
+            try:
+                self.salvar()
+                break
+            except ConflitoDeVersao:
+                self._metricas["conflitos"] += 1
+                self._aguardar_nova_tentativa(tentativa)
+                self.recarregar()
+                resultados = [operacao(self) for operacao in operacoes]
+        else:
+            raise ConflitoDeVersao(self.caminho)
+        latencia = (time.perf_counter() - inicio) * 1000
+
+        m = self._metricas
+        m["descargas"] += 1
+        m["operacoes"] += len(operacoes)
+        m["lote_ultimo"] = len(operacoes)
+        m["lote_max"] = max(m["lote_max"], len(operacoes))
+        m["latencia_ultima_ms"] = latencia
+        m["latencia_max_ms"] = max(m["latencia_max_ms"], latencia)
+        m["latencia_total_ms"] += latencia
+        m["divergencias"] += sum(1 for antes, depois in zip(originais, resultados) if antes != depois)
+        self.resultados_grupo.extend(zip(operacoes, resultados))
+        self._grupo["operacoes"] = []
+        self._grupo["resultados"] = []
+
+    def metricas_gravacao(self) -> Dict[str, Any]:
+        """Métricas dos lotes gravados por commit_em_grupo() (latências em ms)."""
+        m = dict(self._metricas)
+        descargas = m["descargas"] or 1
+        m["lote_medio"] = m["operacoes"] / descargas
+        m["latencia_media_ms"] = m.pop("latencia_total_ms") / descargas
+        return m
+
+    @property
+    def colecoes(self) -> Dict[str, Any]:
+        return self.dados["collections"]
+
+    def _marcar(self, colecao: str) -> None:
+        self._colecoes_sujas.add(colecao)
+        self._mutacoes += 1
+
+    # ===== COLEÇÕES =====
+
+    def criar_colecao(self, nome: str) -> None:
+        self.colecoes[nome] = {"games": []}
+        self._indices.pop(nome, None)
+        self._ordenados.pop(nome, None)
+        self._marcar(nome)
+
+    def deletar_colecao(self, nome: str) -> None:
+        self.colecoes.pop(nome, None)
+        self._indices.pop(nome, None)
+        self._ordenados.pop(nome, None)
+        self._marcar(nome)
+
+    def jogos(self, colecao: str) -> List[Dict[str, Any]]:
+        return self.colecoes.get(colecao, {}).get("games", [])
+
+    def percorrer_jogos(self, colecao: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Gera pares (coleção, jogo) de uma coleção ou de todas, sem montar listas."""
+        nomes = [colecao] if colecao is not None else list(self.colecoes)
+        for nome in nomes:
+            for jogo in self.jogos(nome):
+                yield nome, jogo
+
+    # ===== JOGOS =====
+
+    def _indice(self, colecao: str) -> Dict[str, int]:
+        indice = self._indices.get(colecao)
+        if indice is None:
+            indice = {}
+            for i, g in enumerate(self.jogos(colecao)):
+                # Mantém a primeira ocorrência, como a busca linear fazia
+                indice.setdefault(g["title"].lower(), i)
+            self._indices[colecao] = indice
+        return indice
+
+    def buscar_jogo(self, colecao: str, titulo: str) -> Optional[Dict[str, Any]]:
+        """Retorna o dicionário do jogo (sem copiá-lo) ou None."""
+        i = self._indice(colecao).get(titulo.lower())
+        return None if i is None else self.jogos(colecao)[i]
+
+    def adicionar_jogo(self, colecao: str, jogo: Dict[str, Any]) -> None:
+        games = self.colecoes[colecao]["games"]
+        ordem = self._ordem_mantida(colecao)
+        games.append(jogo)
+        self._descartar_resumo(colecao)
+        self._marcar(colecao)
+        if colecao in self._indices:
+            self._indices[colecao].setdefault(jogo["title"].lower(), len(games) - 1)
+        if ordem is not None:
+            indices.inserir(ordem, jogo, colecao, len(games) - 1)
+
+    def remover_jogo(self, colecao: str, titulo: str) -> None:
+        col = self.colecoes[colecao]
+        col["games"] = [g for g in col["games"] if g["title"].lower() != titulo.lower()]
+        # As posições mudaram: os índices são reconstruídos na próxima consulta
+        self._indices.pop(colecao, None)
+        self._ordenados.pop(colecao, None)
+        self._descartar_resumo(colecao)
+        self._marcar(colecao)
+
+    def substituir_jogos(self, colecao: str, jogos: List[Dict[str, Any]]) -> None:
+        """Troca a lista de jogos da coleção inteira (índices e resumo são refeitos sob demanda)."""
+        col = self.colecoes[colecao]
+        col["games"] = jogos
+        self._indices.pop(colecao, None)
+        self._ordenados.pop(colecao, None)
+        self._descartar_resumo(colecao)
+        self._marcar(colecao)
+
+    def atualizar_jogo(self, colecao: str, titulo: str, campos: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Altera campos de um jogo diretamente no dicionário armazenado.
+
+        Os campos usam os nomes de Jogo (titulo, genero, plataforma, status,
+        horas_jogadas, avaliacao). Somente os valores que realmente mudam são
+        validados e gravados, e o delta resultante é devolvido. Lança KeyError se
+        o jogo não existir e ValueError se a alteração violar alguma regra de Jogo.
+        """
+        indice = self._indice(colecao)
+        chave = titulo.lower()
+        if chave not in indice:
+            raise KeyError(titulo)
+        posicao = indice[chave]
+        jogo = self.jogos(colecao)[posicao]
+
+        alterados = {}
+        for campo, novo in campos.items():
+            if isinstance(novo, StatusJogo):
+                novo = novo.value
+            if jogo.get(CHAVES_JSON[campo]) != novo:
+                alterados[CHAVES_JSON[campo]] = novo
+        if not alterados:
+            return {}
+
+        validar_campos(jogo, alterados)
+        ordem = None
+        if alterados.keys() & {"title", "horas_jogadas", "avaliacao"}:
+            ordem = self._ordem_mantida(colecao)
+        if ordem is not None:
+            indices.remover(ordem, jogo, colecao, posicao)
+        jogo.update(alterados)
+        if ordem is not None:
+            indices.inserir(ordem, jogo, colecao, posicao)
+
+        if "title" in alterados and alterados["title"].lower() != chave:
+            # Outro jogo da coleção pode ter o título antigo (ou vir antes com o novo):
+            # o índice é reconstruído na próxima busca
+            self._indices.pop(colecao, None)
+
+        self._descartar_resumo(colecao)
+        self._marcar(colecao)
+        return alterados
+
+    # ===== ÍNDICES ORDENADOS =====
+
+    def _ordem_mantida(self, colecao: str) -> Optional[Dict[str, Any]]:
+        """Índices ordenados da coleção, se existirem e estiverem em dia (senão são descartados)."""
+        ordem = self._ordenados.get(colecao)
+        if ordem is None:
+            return None
+        if colecao not in self.colecoes or ordem["n"] != len(self.jogos(colecao)):
+            # A lista de jogos foi alterada por fora: o índice é refeito na próxima consulta
+            del self._ordenados[colecao]
+            return None
+        return ordem
+
+    def indices_ordenados(self, colecao: Optional[str] = None) -> None:
+        """
+        Constrói os índices ordenados que faltam (de uma coleção ou de todas).
+
+        Os índices ficam só em memória; a partir daí adicionar_jogo() e
+        atualizar_jogo() os mantêm em dia, então consultas seguidas no mesmo
+        processo (ex.: um script que usa o armazenamento diretamente) não
+        reordenam o catálogo. Sem eles, ranking(), faixa() e posicao() fazem
+        uma passada pelos jogos a cada consulta.
+        """
+        nomes = [colecao] if colecao is not None else list(self.colecoes)
+        for nome in nomes:
+            if nome in self.colecoes and self._ordem_mantida(nome) is None:
+                with perfil.fase("indices.construir"):
+                    self._ordenados[nome] = indices.construir(self.jogos(nome), nome)
+
+    def _escopo(self, campo: str, colecao: Optional[str]) -> List[str]:
+        if campo not in indices.CAMPOS:
+            raise ValueError(f"Campo de ordenação inválido: '{campo}'.")
+        nomes = [colecao] if colecao is not None else list(self.colecoes)
+        return [nome for nome in nomes if nome in self.colecoes]
+
+    def _ordens(self, campo: str, nomes: List[str]) -> Optional[List[List[List[Any]]]]:
+        """Listas ordenadas de `campo` das coleções, se todas tiverem índice (senão None)."""
+        listas = []
+        for nome in nomes:
+            ordem = self._ordem_mantida(nome)
+            if ordem is None:
+                return None
+            listas.append(ordem[campo])
+        return listas
+
+    def _chaves(self, campo: str, nomes: List[str]) -> Iterator[List[Any]]:
+        # Sem índice: uma passada pelas coleções gerando as chaves fora de ordem
+        for nome in nomes:
+            jogos = self.jogos(nome)
+            perfil.contar(registros=len(jogos))
+            yield from indices.chaves(jogos, campo, nome)
+
+    @staticmethod
+    def _selecionar(chaves: Iterator[List[Any]], limite: Optional[int]) -> List[List[Any]]:
+        # Com limite, só as `limite` primeiras são selecionadas (heap), sem ordenar tudo
+        with perfil.fase("indices.selecionar"):
+            if limite is None:
+                return sorted(chaves)
+            return heapq.nsmallest(limite, chaves)
+
+    def _percorrer_ordem(self, entradas: Iterable[List[Any]],
+                         limite: Optional[int]) -> Iterator[Tuple[str, Dict[str, Any], List[Any]]]:
+        # A chave termina com a coleção e a posição do jogo, então cada entrada aponta
+        # para um único jogo mesmo com títulos repetidos
+        for entrada in islice(entradas, limite):
+            nome, posicao = entrada[2], entrada[3]
+            yield nome, self.jogos(nome)[posicao], entrada
+
+    @staticmethod
+    def _intercalar(intervalos: List[Tuple[List[List[Any]], int, int]]) -> Iterator[List[Any]]:
+        # Intercala os trechos [início, fim) de cada coleção, já ordenados, sem reordenar
+        def trecho(lista, inicio, fim):
+            for i in range(inicio, fim):
+                yield lista[i]
+
+        return heapq.merge(*(trecho(*intervalo) for intervalo in intervalos))
+
+    def ranking(self, campo: str, colecao: Optional[str] = None, apos: Optional[List[Any]] = None,
+                limite: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any], List[Any]]]:
+        """
+        Gera triplas (coleção, jogo, chave) do maior para o menor valor de `campo`
+        ("horas" ou "avaliacao"), empatando pelo título.
+
+        `apos` é a chave (ver indices.chave) do último item já exibido; a listagem
+        continua logo depois dela. Com `limite`, gera no máximo esse número de
+        itens; sem índices em memória, eles são selecionados sem ordenar o resto.
+        """
+        nomes = self._escopo(campo, colecao)
+        listas = self._ordens(campo, nomes)
+        if listas is not None:
+            intervalos = []
+            for lista in listas:
+                inicio = bisect_right(lista, list(apos)) if apos is not None else 0
+                intervalos.append((lista, inicio, len(lista)))
+            return self._percorrer_ordem(self._intercalar(intervalos), limite)
+        chaves = self._chaves(campo, nomes)
+        if apos is not None:
+            chaves = (c for c in chaves if c > list(apos))
+        return self._percorrer_ordem(self._selecionar(chaves, limite), limite)
+
+    def faixa(self, campo: str, minimo: float, maximo: float, colecao: Optional[str] = None,
+              apos: Optional[List[Any]] = None,
+              limite: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any], List[Any]]]:
+        """Como ranking(), mas só com os jogos em que minimo <= valor <= maximo."""
+        nomes = self._escopo(campo, colecao)
+        listas = self._ordens(campo, nomes)
+        if listas is not None:
+            intervalos = []
+            for lista in listas:
+                inicio, fim = indices.faixa(lista, minimo, maximo)
+                if apos is not None:
+                    inicio = max(inicio, bisect_right(lista, list(apos)))
+                intervalos.append((lista, inicio, fim))
+            return self._percorrer_ordem(self._intercalar(intervalos), limite)
+        # Os valores estão negados na chave: minimo <= v <= maximo  <=>  -maximo <= -v <= -minimo
+        chaves = (c for c in self._chaves(campo, nomes) if -maximo <= c[0] <= -minimo)
+        if apos is not None:
+            chaves = (c for c in chaves if c > list(apos))
+        return self._percorrer_ordem(self._selecionar(chaves, limite), limite)
+
+    def posicao(self, campo: str, colecao: str, titulo: str,
+                todas: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        Posição (a partir de 1) do jogo no ranking de `campo` e o total do ranking,
+        na própria coleção ou, com `todas`, entre todas as coleções.
+
+        Retorna None se o jogo não existir ou não entrar no ranking (jogo sem
+        avaliação, no caso de "avaliacao"). Sem índices em memória, conta os
+        jogos que vêm antes em uma passada, sem ordenar.
+        """
+        nomes = self._escopo(campo, None if todas else colecao)
+        posicao = self._indice(colecao).get(titulo.lower())
+        if posicao is None:
+            return None
+        c = indices.chave(self.jogos(colecao)[posicao], campo, colecao, posicao)
+        if c is None:
+            return None
+        antes = total = 0
+        listas = self._ordens(campo, nomes)
+        if listas is not None:
+            for lista in listas:
+                antes += indices.posicao(lista, c)
+                total += len(lista)
+        else:
+            for outra in self._chaves(campo, nomes):
+                antes += outra < c
+                total += 1
+        return antes + 1, total
+
+    # ===== ESTATÍSTICAS =====
+
+    def _descartar_resumo(self, colecao: str) -> None:
+        self.colecoes[colecao].pop("estatisticas", None)
+
+    def resumo_estatistico(self, colecao: Optional[str] = None, guardar: bool = False) -> Estatisticas:
+        """
+        Estatísticas de uma coleção ou de todas (os resumos das coleções são mesclados).
+
+        Resumos já guardados (e ainda em dia) são sempre reaproveitados. Com
+        `guardar`, o resumo de cada coleção sem resumo é guardado dentro dela e
+        a coleção é marcada como alterada, para que transacao() o grave; sem
+        `guardar`, nada é alterado.
+        """
+        total = Estatisticas()
+        nomes = [colecao] if colecao is not None else list(self.colecoes)
+        for nome in nomes:
+            if nome not in self.colecoes:
+                continue
+            col, jogos = self.colecoes[nome], self.jogos(nome)
+            guardado = col.get("estatisticas")
+            if guardado is not None and guardado.get("n") == len(jogos):
+                total.mesclar(Estatisticas.de_dict(guardado["resumo"]))
+                continue
+            with perfil.fase("estatisticas.resumir"):
+                resumo = resumir(jogos)
+            perfil.contar(registros=len(jogos))
+            if guardar:
+                col["estatisticas"] = {"n": len(jogos), "resumo": resumo.para_dict()}
+                self._marcar(nome)
+            total.mesclar(resumo)
+        return total
+
+
+class _ColecoesFragmentadas(MutableMapping):
+    """
+    Visão das coleções de um ArmazenamentoFragmentado.
+
+    Os nomes vêm do manifesto; o arquivo de uma coleção só é lido quando ela é
+    acessada. Verificar se uma coleção existe ou listar os nomes não lê nenhum
+    arquivo de coleção.
+    """
+
+    def __init__(self, armazenamento: "ArmazenamentoFragmentado"):
+        self._arm = armazenamento
+
+    def __getitem__(self, nome: str) -> Dict[str, Any]:
+        return self._arm._carregar_fragmento(nome)
+
+    def __setitem__(self, nome: str, colecao: Dict[str, Any]) -> None:
+        self._arm.dados["collections"][nome] = {"arquivo": _nome_fragmento(nome)}
+        self._arm._fragmentos[nome] = colecao
+
+    def __delitem__(self, nome: str) -> None:
+        del self._arm.dados["collections"][nome]
+        self._arm._fragmentos.pop(nome, None)
+
+    def pop(self, nome: str, *padrao):
+        # Remove sem ler o arquivo da coleção (MutableMapping.pop o leria)
+        if nome not in self:
+            if padrao:
+                return padrao[0]
+            raise KeyError(nome)
+        colecao = self._arm._fragmentos.get(nome)
+        del self[nome]
+        return colecao
+
+    def __contains__(self, nome) -> bool:
+        return nome in self._arm.dados["collections"]
+
+    def __iter__(self):
+        return iter(self._arm.dados["collections"])
+
+    def __len__(self) -> int:
+        return len(self._arm.dados["collections"])
+
+
+def _nome_fragmento(nome: str) -> str:
+    """Nome de arquivo seguro e estável para uma coleção."""
+    legivel = re.sub(r"[^\w-]+", "_", nome)[:40]
+    resumo = hashlib.sha1(nome.encode("utf-8")).hexdigest()[:8]
+    return f"{legivel}-{resumo}.json"
+
+
+class ArmazenamentoFragmentado(Armazenamento):
+    """
+    Armazenamento com um arquivo por coleção.
+
+    `caminho` aponta para o manifesto ({"versao": n, "collections": {nome: {"arquivo": ...}}});
+    os arquivos das coleções ficam no subdiretório "colecoes" ao lado dele. O
+    manifesto é o arquivo travado e versionado, então as garantias de concorrência
+    são as mesmas do armazenamento em arquivo único.
+    """
+
+    def __init__(self, caminho: str, dados: Optional[Dict[str, Any]] = None, sincronizar: bool = False):
+        # Coleções já lidas (ou criadas) nesta sessão
+        self._fragmentos: Dict[str, Dict[str, Any]] = {}
+        super().__init__(caminho, dados, sincronizar)
+        self.diretorio = os.path.join(os.path.dirname(caminho), "colecoes")
+        # O arquivo .lock fica ao lado do manifesto (caminho + ".lock"), então o diretório
+        # do manifesto precisa existir antes da primeira trava; o de fragmentos, antes da
+        # primeira gravação
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._visao = _ColecoesFragmentadas(self)
+
+    @property
+    def colecoes(self) -> MutableMapping:
+        return self._visao
+
+    def recarregar(self) -> None:
+        super().recarregar()
+        self._fragmentos = {}
+
+    def _caminho_fragmento(self, nome: str) -> str:
+        return os.path.join(self.diretorio, self.dados["collections"][nome]["arquivo"])
+
+    def _carregar_fragmento(self, nome: str) -> Dict[str, Any]:
+        if nome not in self._fragmentos:
+            if nome not in self.dados["collections"]:
+                raise KeyError(nome)
+            with perfil.fase("armazenamento.ler_colecao"), _travar(self.caminho, exclusiva=False):
+                try:
+                    self._fragmentos[nome] = _ler_json(self._caminho_fragmento(nome))
+                except FileNotFoundError:
+                    self._fragmentos[nome] = {"games": []}
+        return self._fragmentos[nome]
+
+    def percorrer_jogos(self, colecao: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        # Coleções que ainda não estavam em memória são lidas uma por vez e descartadas
+        # em seguida, para que percorrer tudo não mantenha todos os arquivos carregados
+        nomes = [colecao] if colecao is not None else list(self.colecoes)
+        for nome in nomes:
+            if nome not in self.colecoes:
+                continue
+            ja_carregada = nome in self._fragmentos
+            for jogo in self.jogos(nome):
+                yield nome, jogo
+            if not ja_carregada and nome not in self._colecoes_sujas:
+                self._fragmentos.pop(nome, None)
+                self._indices.pop(nome, None)
+                self._ordenados.pop(nome, None)
+
+    def _gravar_arquivos(self) -> None:
+        removidas = []
+        for nome in self._colecoes_sujas:
+            if nome in self.dados["collections"]:
+                _gravar_json(self._caminho_fragmento(nome), self._fragmentos[nome], self.sincronizar)
+            else:
+                removidas.append(_nome_fragmento(nome))
+        # O manifesto é gravado depois dos arquivos das coleções que ele referencia
+        _gravar_json(self.caminho, self.dados, self.sincronizar)
+        for arquivo in removidas:
+            try:
+                os.remove(os.path.join(self.diretorio, arquivo))
+            except FileNotFoundError:
+                pass
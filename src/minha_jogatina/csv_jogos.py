@@ -0,0 +1,87 @@
+"""
+Importação e exportação de jogos em CSV, processadas em blocos.
+
+As linhas são lidas e escritas em blocos de tamanho fixo, sem montar a lista
+completa do arquivo. Cada linha importada é validada com as regras de Jogo
+(as mesmas usadas por Armazenamento.atualizar_jogo()).
+"""
+
+import csv
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from .armazenamento import validar_campos
+from .models.status import StatusJogo
+
+COLUNAS = ["colecao", "titulo", "genero", "plataforma", "status", "horas_jogadas", "avaliacao"]
+PLATAFORMAS = {"pc": "PC", "console": "Console", "mobile": "Mobile"}
+
+
+def linha_para_jogo(linha: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converte uma linha do CSV no dicionário usado pelo armazenamento.
+
+    Lança ValueError se algum valor for inválido ou violar as regras de Jogo.
+    """
+    plataforma = PLATAFORMAS.get((linha.get("plataforma") or "").strip().lower())
+    if plataforma is None:
+        raise ValueError(f"Plataforma inválida: '{linha.get('plataforma')}'.")
+
+    texto_status = (linha.get("status") or "").strip()
+    for status in StatusJogo:
+        if texto_status in (status.name, status.value):
+            break
+    else:
+        raise ValueError(f"Status inválido: '{texto_status}'.")
+
+    try:
+        horas = float(linha.get("horas_jogadas") or 0)
+        avaliacao = linha.get("avaliacao")
+        avaliacao = float(avaliacao) if avaliacao not in (None, "") else None
+    except ValueError:
+        raise ValueError("Horas jogadas e avaliação devem ser números.")
+    jogo = {
+        "title": (linha.get("titulo") or "").strip(),
+        "genero": (linha.get("genero") or "").strip(),
+        "platform": plataforma,
+        "status": status.value,
+        "horas_jogadas": horas,
+        "avaliacao": avaliacao,
+    }
+    # Todos os campos são "novos", então todas as regras são verificadas
+    validar_campos({}, jogo)
+    return jogo
+
+
+def jogo_para_linha(colecao: str, jogo: Dict[str, Any]) -> List[Any]:
+    avaliacao = jogo.get("avaliacao")
+    return [colecao, jogo["title"], jogo.get("genero", ""), jogo.get("platform", ""),
+            jogo.get("status", ""), jogo.get("horas_jogadas", 0),
+            "" if avaliacao is None else avaliacao]
+
+
+def ler_em_blocos(arquivo: TextIO, tamanho_bloco: int = 10000) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    """Lê o CSV (com cabeçalho) e gera blocos de (número da linha, linha)."""
+    leitor = csv.DictReader(arquivo)
+    # A linha 1 é o cabeçalho
+    numeradas = ((leitor.line_num, linha) for linha in leitor)
+    while True:
+        bloco = list(islice(numeradas, tamanho_bloco))
+        if not bloco:
+            return
+        yield bloco
+
+
+def escrever_em_blocos(arquivo: TextIO, jogos: Iterable[Tuple[str, Dict[str, Any]]],
+                       tamanho_bloco: int = 10000) -> int:
+    """Escreve pares (coleção, jogo) no CSV, um bloco por vez. Retorna o total de linhas."""
+    escritor = csv.writer(arquivo)
+    escritor.writerow(COLUNAS)
+    linhas = (jogo_para_linha(colecao, jogo) for colecao, jogo in jogos)
+    total = 0
+    while True:
+        bloco = list(islice(linhas, tamanho_bloco))
+        if not bloco:
+            return total
+        escritor.writerows(bloco)
+        total += len(bloco)
@@ -1,6 +1,10 @@
+import asyncio
 import json
+import os
 import sqlite3
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
 from pathlib import Path
 from .models.jogo import Jogo, JogoPC, JogoConsole, JogoMobile
 from .colecoes.colecao import Colecao
@@ -37,8 +41,12 @@ class RepositorioDados:
                 'avaliacao': jogo.avaliacao,
                 'tipo': type(jogo).__name__
             })
-        with open(self.caminho, 'w') as f:
+        # Grava em um arquivo temporário e troca de uma vez: uma leitura feita durante
+        # a gravação (ex.: por outra thread de RepositorioDadosAsync) vê o arquivo antigo
+        temporario = self.caminho.with_name(f"{self.caminho.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temporario, 'w') as f:
             json.dump(dados, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
 
     def _carregar_json(self) -> List[Jogo]:
         if not self.caminho.exists():
@@ -62,3 +70,74 @@ class RepositorioDados:
                 jogo._avaliacao = item['avaliacao']
             jogos.append(jogo)
         return jogos
+
+
+class RepositorioDadosAsync:
+    """
+    Versão assíncrona de RepositorioDados para uso dentro de um event loop (asyncio).
+
+    A E/S de disco roda em um pool limitado de threads, então o loop não fica
+    bloqueado. Chamadas de salvar_jogos() que chegam enquanto uma gravação ainda
+    não começou são agrupadas: só a lista mais recente é gravada, e todas as
+    chamadas aguardam essa mesma gravação.
+    """
+
+    def __init__(self, formato="json", arquivo="dados.json", max_threads: int = 2):
+        self._repo = RepositorioDados(formato=formato, arquivo=arquivo)
+        self._executor = ThreadPoolExecutor(max_workers=max_threads,
+                                            thread_name_prefix="minha-jogatina-io")
+        # Lista mais recente ainda não gravada e o futuro de quem espera por ela
+        self._pendente: Optional[List[Jogo]] = None
+        self._proxima: Optional[asyncio.Future] = None
+        self._gravador: Optional[asyncio.Task] = None
+        self.gravacoes = 0
+
+    async def carregar_jogos(self) -> List[Jogo]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._repo.carregar_jogos)
+
+    async def iterar_jogos(self, tamanho_lote: int = 500) -> AsyncIterator[Jogo]:
+        """Percorre os jogos devolvendo o controle ao loop a cada lote."""
+        jogos = await self.carregar_jogos()
+        for i, jogo in enumerate(jogos, 1):
+            yield jogo
+            if i % tamanho_lote == 0:
+                await asyncio.sleep(0)
+
+    async def salvar_jogos(self, jogos: List[Jogo]) -> None:
+        loop = asyncio.get_running_loop()
+        self._pendente = list(jogos)
+        if self._proxima is None:
+            self._proxima = loop.create_future()
+        futuro = self._proxima
+        if self._gravador is None or self._gravador.done():
+            self._gravador = loop.create_task(self._gravar())
+        # shield: cancelar quem espera não cancela a gravação dos demais
+        await asyncio.shield(futuro)
+
+    async def _gravar(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._proxima is not None:
+            # Deixa o restante da rajada de chamadas chegar antes de gravar
+            await asyncio.sleep(0)
+            futuro, self._proxima = self._proxima, None
+            jogos, self._pendente = self._pendente, None
+            try:
+                await loop.run_in_executor(self._executor, self._repo.salvar_jogos, jogos)
+            except Exception as e:
+                futuro.set_exception(e)
+            else:
+                self.gravacoes += 1
+                futuro.set_result(None)
+
+    async def fechar(self) -> None:
+        """Aguarda as gravações pendentes e encerra o pool de threads."""
+        if self._gravador is not None:
+            await self._gravador
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "RepositorioDadosAsync":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.fechar()
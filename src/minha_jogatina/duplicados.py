@@ -0,0 +1,172 @@
+"""
+Detecção e mescla de jogos duplicados entre coleções.
+
+Dois jogos são o mesmo jogo quando têm o mesmo título e a mesma plataforma,
+como em Jogo.__eq__. Em vez de comparar todos os pares, cada jogo é agrupado
+por uma chave normalizada (título e plataforma em minúsculas, espaços
+repetidos ignorados) em um dicionário, então encontrar os duplicados de todo
+o catálogo custa uma passada.
+
+Os conflitos entre cópias são resolvidos por uma Politica:
+    horas:     "maior" (padrão), "soma" (só em mesclar_colecoes) ou "primeiro"
+    status:    "mais_avancado" (padrão: NÃO INICIADO < JOGANDO < FINALIZADO),
+               "ultimo" ou "primeiro"
+    avaliacao: "manter" (padrão: a primeira avaliação encontrada), "maior" ou "media"
+"Primeiro" e "último" seguem a ordem em que as coleções são percorridas.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .armazenamento import Armazenamento, validar_campos
+from .models.status import StatusJogo
+
+Chave = Tuple[str, str]
+
+POLITICAS_HORAS = ["maior", "soma", "primeiro"]
+POLITICAS_STATUS = ["mais_avancado", "ultimo", "primeiro"]
+POLITICAS_AVALIACAO = ["manter", "maior", "media"]
+
+_ORDEM_STATUS = {status.value: i for i, status in enumerate(StatusJogo)}
+
+
+class Politica:
+    """Como resolver cada campo quando as cópias de um jogo divergem."""
+
+    def __init__(self, horas: str = "maior", status: str = "mais_avancado", avaliacao: str = "manter"):
+        for valor, opcoes in ((horas, POLITICAS_HORAS), (status, POLITICAS_STATUS),
+                              (avaliacao, POLITICAS_AVALIACAO)):
+            if valor not in opcoes:
+                raise ValueError(f"Política inválida: '{valor}'.")
+        self.horas = horas
+        self.status = status
+        self.avaliacao = avaliacao
+
+
+def chave(jogo: Dict[str, Any]) -> Chave:
+    """Chave normalizada (título, plataforma) de um jogo no formato do armazenamento."""
+    return " ".join(jogo["title"].split()).casefold(), (jogo.get("platform") or "").casefold()
+
+
+def agrupar(pares: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[Chave, List[Tuple[str, Dict[str, Any]]]]:
+    """Agrupa pares (coleção, jogo) pela chave normalizada, mantendo a ordem de chegada."""
+    grupos: Dict[Chave, List[Tuple[str, Dict[str, Any]]]] = {}
+    for colecao, jogo in pares:
+        grupos.setdefault(chave(jogo), []).append((colecao, jogo))
+    return grupos
+
+
+def duplicados(pares: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[Chave, List[Tuple[str, Dict[str, Any]]]]:
+    """Só os grupos com mais de uma cópia do mesmo jogo."""
+    return {c: grupo for c, grupo in agrupar(pares).items() if len(grupo) > 1}
+
+
+def resolver(copias: List[Dict[str, Any]], politica: Politica) -> Dict[str, Any]:
+    """
+    Combina as cópias de um jogo em um único dicionário, segundo a política.
+
+    Título, gênero e plataforma vêm da primeira cópia. Se o status resultante
+    não for FINALIZADO, a avaliação é descartada. Lança ValueError se o
+    resultado violar alguma regra de Jogo.
+    """
+    if len(copias) == 1:
+        return dict(copias[0])
+    mesclado = dict(copias[0])
+
+    horas = [float(g.get("horas_jogadas") or 0) for g in copias]
+    if politica.horas == "maior":
+        mesclado["horas_jogadas"] = max(horas)
+    elif politica.horas == "soma":
+        mesclado["horas_jogadas"] = sum(horas)
+    else:
+        mesclado["horas_jogadas"] = horas[0]
+
+    if politica.status == "mais_avancado":
+        mesclado["status"] = max((g["status"] for g in copias), key=lambda s: _ORDEM_STATUS.get(s, -1))
+    elif politica.status == "ultimo":
+        mesclado["status"] = copias[-1]["status"]
+    else:
+        mesclado["status"] = copias[0]["status"]
+
+    avaliacoes = [g["avaliacao"] for g in copias if g.get("avaliacao") is not None]
+    avaliacao: Optional[float] = None
+    if avaliacoes:
+        if politica.avaliacao == "maior":
+            avaliacao = max(avaliacoes)
+        elif politica.avaliacao == "media":
+            avaliacao = sum(avaliacoes) / len(avaliacoes)
+        else:
+            avaliacao = avaliacoes[0]
+    if mesclado["status"] != StatusJogo.FINALIZADO.value:
+        avaliacao = None
+    mesclado["avaliacao"] = avaliacao
+
+    try:
+        validar_campos({}, mesclado)
+    except ValueError as e:
+        raise ValueError(f"'{mesclado['title']}' ({mesclado.get('platform')}): {e}")
+    return mesclado
+
+
+def deduplicar(arm: Armazenamento, politica: Politica) -> Dict[str, int]:
+    """
+    Unifica as cópias de cada jogo repetido no catálogo.
+
+    Todas as cópias recebem os valores mesclados (o jogo continua em cada
+    coleção onde aparece), e cópias repetidas dentro da mesma coleção são
+    removidas. Só as coleções que mudam são regravadas. Retorna a quantidade
+    de grupos, de coleções alteradas e de cópias removidas.
+
+    Lança ValueError com a política de horas "soma": como as cópias continuam
+    existindo, cada execução somaria de novo as horas já somadas.
+    """
+    if politica.horas == "soma":
+        raise ValueError("A política de horas 'soma' só vale para mesclar coleções.")
+    grupos = duplicados(arm.percorrer_jogos())
+    mesclados = {c: resolver([g for _, g in grupo], politica) for c, grupo in grupos.items()}
+    afetadas = {colecao for grupo in grupos.values() for colecao, _ in grupo}
+
+    removidos = alteradas = 0
+    for colecao in afetadas:
+        vistos = set()
+        jogos = []
+        for jogo in arm.jogos(colecao):
+            c = chave(jogo)
+            if c in vistos:
+                removidos += 1
+                continue
+            vistos.add(c)
+            jogos.append(dict(mesclados[c]) if c in mesclados else jogo)
+        # Com as políticas aceitas aqui, mesclar cópias já iguais não muda nada, então
+        # coleções já unificadas (ex.: por uma execução anterior) não são regravadas
+        if jogos != arm.jogos(colecao):
+            arm.substituir_jogos(colecao, jogos)
+            alteradas += 1
+    return {"grupos": len(grupos), "removidos": removidos, "colecoes": alteradas}
+
+
+def mesclar_colecoes(arm: Armazenamento, origens: List[str], destino: str,
+                     politica: Politica, remover_origens: bool = False) -> Dict[str, int]:
+    """
+    Junta as coleções `origens` em `destino` (criada se não existir).
+
+    O destino é percorrido primeiro, depois as origens na ordem dada; jogos
+    repetidos viram um só, resolvido pela política. Lança KeyError se alguma
+    origem não existir.
+    """
+    for nome in origens:
+        if nome not in arm.colecoes:
+            raise KeyError(nome)
+    if destino not in arm.colecoes:
+        arm.criar_colecao(destino)
+
+    nomes = list(dict.fromkeys([destino] + origens))
+    grupos = agrupar((nome, jogo) for nome in nomes for jogo in arm.jogos(nome))
+    arm.substituir_jogos(destino, [resolver([g for _, g in grupo], politica) for grupo in grupos.values()])
+
+    if remover_origens:
+        for nome in nomes[1:]:
+            arm.deletar_colecao(nome)
+    return {
+        "jogos": len(grupos),
+        "duplicados": sum(1 for grupo in grupos.values() if len(grupo) > 1),
+    }
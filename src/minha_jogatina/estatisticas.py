@@ -0,0 +1,274 @@
+"""
+Estatísticas do catálogo calculadas em uma única passada, com memória limitada.
+
+Cada estrutura aqui pode ser mesclada com outra do mesmo tipo (mesclar()), então
+é possível resumir cada coleção separadamente — ou em processos diferentes — e
+combinar os resumos depois. Também podem ser convertidas para dicionários JSON
+(para_dict()/de_dict()), o que permite guardá-las junto do armazenamento.
+
+- Histograma: contagens em faixas fixas (exato).
+- Quantis: esboço no estilo KLL. Guarda no máximo alguns "k" valores, e o erro
+  de posição dos quantis fica em torno de 1-2% do total para k=200. Com menos
+  de k valores o resultado é exato.
+- Resumo: total de jogos, horas, contagem por status, histograma de horas e
+  quantis de horas e de avaliação.
+- Estatisticas: um Resumo geral e um por gênero e por plataforma.
+"""
+
+import math
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models.status import StatusJogo
+
+# Limites inferiores das faixas do histograma de horas (a última faixa é "500h ou mais")
+LIMITES_HORAS = [0, 1, 5, 10, 20, 50, 100, 200, 500]
+
+
+class Histograma:
+    """Contagens em faixas fixas: a faixa i vai de limites[i] (inclusive) a limites[i+1]."""
+
+    def __init__(self, limites: Optional[List[float]] = None):
+        self.limites = list(limites if limites is not None else LIMITES_HORAS)
+        self.contagens = [0] * len(self.limites)
+
+    def adicionar(self, valor: float) -> None:
+        # Valores abaixo do primeiro limite entram na primeira faixa
+        self.contagens[max(0, bisect_right(self.limites, valor) - 1)] += 1
+
+    def mesclar(self, outro: "Histograma") -> None:
+        if outro.limites != self.limites:
+            raise ValueError("Não é possível mesclar histogramas com faixas diferentes.")
+        self.contagens = [a + b for a, b in zip(self.contagens, outro.contagens)]
+
+    def faixas(self) -> List[Tuple[str, int]]:
+        """Pares (rótulo da faixa, contagem), ex.: ("10-20h", 4)."""
+        rotulos = []
+        for i, inicio in enumerate(self.limites):
+            if i + 1 < len(self.limites):
+                rotulos.append(f"{inicio:g}-{self.limites[i + 1]:g}h")
+            else:
+                rotulos.append(f"{inicio:g}h+")
+        return list(zip(rotulos, self.contagens))
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {"limites": self.limites, "contagens": self.contagens}
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Histograma":
+        histograma = cls(dados["limites"])
+        histograma.contagens = list(dados["contagens"])
+        return histograma
+
+
+class Quantis:
+    """
+    Esboço de quantis no estilo KLL.
+
+    Os valores entram no nível 0. Quando um nível passa da sua capacidade, ele é
+    ordenado e metade dos valores (um sim, um não) sobe para o nível seguinte,
+    onde cada valor passa a representar o dobro de itens. Os níveis mais altos
+    têm capacidade k e os mais baixos capacidades menores (fator 2/3 por nível),
+    então o tamanho total fica limitado em torno de 3k.
+    """
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.n = 0
+        self.minimo: Optional[float] = None
+        self.maximo: Optional[float] = None
+        self.niveis: List[List[float]] = [[]]
+        # Alterna qual metade sobe em cada nível, para não favorecer sempre a mesma
+        self._alternancia: List[int] = [0]
+
+    def _capacidade(self, nivel: int) -> int:
+        profundidade = len(self.niveis) - 1 - nivel
+        return max(2, math.ceil(self.k * (2 / 3) ** profundidade))
+
+    def adicionar(self, valor: float) -> None:
+        self.n += 1
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        self.niveis[0].append(valor)
+        if len(self.niveis[0]) >= self._capacidade(0):
+            self._compactar()
+
+    def _compactar(self) -> None:
+        nivel = 0
+        while nivel < len(self.niveis):
+            itens = self.niveis[nivel]
+            if len(itens) >= self._capacidade(nivel):
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append([])
+                    self._alternancia.append(0)
+                itens.sort()
+                # Com quantidade ímpar, o último valor fica neste nível
+                sobra = [itens.pop()] if len(itens) % 2 else []
+                inicio = self._alternancia[nivel]
+                self._alternancia[nivel] ^= 1
+                self.niveis[nivel + 1].extend(itens[inicio::2])
+                self.niveis[nivel] = sobra
+            nivel += 1
+
+    def mesclar(self, outro: "Quantis") -> None:
+        if outro.n == 0:
+            return
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append([])
+            self._alternancia.append(0)
+        for nivel, itens in enumerate(outro.niveis):
+            self.niveis[nivel].extend(itens)
+        self.n += outro.n
+        self.minimo = outro.minimo if self.minimo is None else min(self.minimo, outro.minimo)
+        self.maximo = outro.maximo if self.maximo is None else max(self.maximo, outro.maximo)
+        self._compactar()
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Valor aproximado do quantil q (0 a 1), ou None se não há valores."""
+        if self.n == 0:
+            return None
+        if q <= 0:
+            return self.minimo
+        if q >= 1:
+            return self.maximo
+        pesados = sorted((valor, 1 << nivel) for nivel, itens in enumerate(self.niveis) for valor in itens)
+        alvo = q * sum(peso for _, peso in pesados)
+        acumulado = 0
+        for valor, peso in pesados:
+            acumulado += peso
+            if acumulado >= alvo:
+                return valor
+        return self.maximo
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "minimo": self.minimo, "maximo": self.maximo,
+                "niveis": self.niveis, "alternancia": self._alternancia}
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Quantis":
+        quantis = cls(dados["k"])
+        quantis.n = dados["n"]
+        quantis.minimo = dados["minimo"]
+        quantis.maximo = dados["maximo"]
+        quantis.niveis = [list(itens) for itens in dados["niveis"]]
+        quantis._alternancia = list(dados["alternancia"])
+        return quantis
+
+
+class Resumo:
+    """Totais, histograma de horas e quantis de horas e de avaliação de um conjunto de jogos."""
+
+    def __init__(self, k: int = 200, limites_horas: Optional[List[float]] = None):
+        self.total = 0
+        self.horas_total = 0.0
+        self.por_status = {status.value: 0 for status in StatusJogo}
+        self.histograma_horas = Histograma(limites_horas)
+        self.horas = Quantis(k)
+        # Como em Relatorio.media_avaliacao_finalizados(), só jogos finalizados e avaliados
+        self.avaliacao = Quantis(k)
+
+    def adicionar(self, jogo: Dict[str, Any]) -> None:
+        """Inclui um jogo no formato do armazenamento."""
+        horas = float(jogo.get("horas_jogadas") or 0)
+        self.total += 1
+        self.horas_total += horas
+        status = jogo.get("status")
+        self.por_status[status] = self.por_status.get(status, 0) + 1
+        self.histograma_horas.adicionar(horas)
+        self.horas.adicionar(horas)
+        if status == StatusJogo.FINALIZADO.value and jogo.get("avaliacao"):
+            self.avaliacao.adicionar(float(jogo["avaliacao"]))
+
+    def mesclar(self, outro: "Resumo") -> None:
+        self.total += outro.total
+        self.horas_total += outro.horas_total
+        for status, quantidade in outro.por_status.items():
+            self.por_status[status] = self.por_status.get(status, 0) + quantidade
+        self.histograma_horas.mesclar(outro.histograma_horas)
+        self.horas.mesclar(outro.horas)
+        self.avaliacao.mesclar(outro.avaliacao)
+
+    def relatorio(self) -> Dict[str, Any]:
+        """Valores calculados (medianas, p90, histograma) prontos para exibição."""
+        return {
+            "jogos": self.total,
+            "horas_total": self.horas_total,
+            "por_status": dict(self.por_status),
+            "horas": {"mediana": self.horas.quantil(0.5), "p90": self.horas.quantil(0.9),
+                      "maximo": self.horas.maximo},
+            "avaliacao": {"avaliados": self.avaliacao.n, "mediana": self.avaliacao.quantil(0.5),
+                          "p90": self.avaliacao.quantil(0.9)},
+            "histograma_horas": dict(self.histograma_horas.faixas()),
+        }
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "horas_total": self.horas_total,
+            "por_status": self.por_status,
+            "histograma_horas": self.histograma_horas.para_dict(),
+            "horas": self.horas.para_dict(),
+            "avaliacao": self.avaliacao.para_dict(),
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Resumo":
+        resumo = cls()
+        resumo.total = dados["total"]
+        resumo.horas_total = dados["horas_total"]
+        resumo.por_status = dict(dados["por_status"])
+        resumo.histograma_horas = Histograma.de_dict(dados["histograma_horas"])
+        resumo.horas = Quantis.de_dict(dados["horas"])
+        resumo.avaliacao = Quantis.de_dict(dados["avaliacao"])
+        return resumo
+
+
+class Estatisticas:
+    """Resumo geral mais um Resumo por gênero e por plataforma."""
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.geral = Resumo(k)
+        self.por_genero: Dict[str, Resumo] = {}
+        self.por_plataforma: Dict[str, Resumo] = {}
+
+    def _grupo(self, grupos: Dict[str, Resumo], nome: str) -> Resumo:
+        if nome not in grupos:
+            grupos[nome] = Resumo(self.k)
+        return grupos[nome]
+
+    def adicionar(self, jogo: Dict[str, Any]) -> None:
+        self.geral.adicionar(jogo)
+        self._grupo(self.por_genero, jogo.get("genero") or "").adicionar(jogo)
+        self._grupo(self.por_plataforma, jogo.get("platform") or "").adicionar(jogo)
+
+    def mesclar(self, outra: "Estatisticas") -> None:
+        self.geral.mesclar(outra.geral)
+        for grupos, outros in ((self.por_genero, outra.por_genero),
+                               (self.por_plataforma, outra.por_plataforma)):
+            for nome, resumo in outros.items():
+                self._grupo(grupos, nome).mesclar(resumo)
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "geral": self.geral.para_dict(),
+            "por_genero": {nome: r.para_dict() for nome, r in self.por_genero.items()},
+            "por_plataforma": {nome: r.para_dict() for nome, r in self.por_plataforma.items()},
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Estatisticas":
+        estatisticas = cls(dados["k"])
+        estatisticas.geral = Resumo.de_dict(dados["geral"])
+        estatisticas.por_genero = {nome: Resumo.de_dict(r) for nome, r in dados["por_genero"].items()}
+        estatisticas.por_plataforma = {nome: Resumo.de_dict(r) for nome, r in dados["por_plataforma"].items()}
+        return estatisticas
+
+
+def resumir(jogos: Iterable[Dict[str, Any]], k: int = 200) -> Estatisticas:
+    """Calcula as estatísticas de jogos no formato do armazenamento em uma passada."""
+    estatisticas = Estatisticas(k)
+    for jogo in jogos:
+        estatisticas.adicionar(jogo)
+    return estatisticas
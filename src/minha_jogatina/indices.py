@@ -0,0 +1,105 @@
+"""
+Índices ordenados por horas jogadas e por avaliação.
+
+Para cada coleção, listas de chaves já ordenadas (mantidas só em memória):
+    {"n": <quantidade de jogos>, "horas": [[-horas, título, coleção, posição], ...],
+     "avaliacao": [...]}
+
+A chave começa como a de Relatorio.chave_horas/chave_avaliacao (valor negado
+para que a ordem crescente seja "maior primeiro", empates pelo título em
+minúsculas). A coleção e a posição do jogo na lista da coleção desempatam jogos
+com o mesmo título (ex.: em plataformas diferentes) e apontam para o jogo sem
+outra busca. As listas são mantidas com bisect: inserir, remover e localizar
+fazem O(log n) comparações. Só jogos avaliados entram no índice de avaliação,
+como em Relatorio.ordenar_por_avaliacao().
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import perfil
+
+CAMPOS = ("horas", "avaliacao")
+
+
+def chave(jogo: Dict[str, Any], campo: str, colecao: str, posicao: int) -> Optional[List[Any]]:
+    """
+    Chave no índice do jogo (no formato do armazenamento) que está na posição
+    `posicao` de `colecao`, ou None se ele não entra no índice.
+    """
+    titulo = jogo["title"].lower()
+    if campo == "horas":
+        return [-float(jogo.get("horas_jogadas") or 0), titulo, colecao, posicao]
+    avaliacao = jogo.get("avaliacao")
+    return [-float(avaliacao), titulo, colecao, posicao] if avaliacao else None
+
+
+def chaves(jogos: List[Dict[str, Any]], campo: str, colecao: str) -> Iterator[List[Any]]:
+    """Chaves (fora de ordem) dos jogos da coleção que entram no índice de `campo`."""
+    for i, jogo in enumerate(jogos):
+        c = chave(jogo, campo, colecao, i)
+        if c is not None:
+            yield c
+
+
+def construir(jogos: List[Dict[str, Any]], colecao: str) -> Dict[str, Any]:
+    perfil.contar(registros=len(jogos))
+    indices: Dict[str, Any] = {"n": len(jogos)}
+    for campo in CAMPOS:
+        indices[campo] = sorted(chaves(jogos, campo, colecao))
+    return indices
+
+
+def inserir(indices: Dict[str, Any], jogo: Dict[str, Any], colecao: str, posicao: int) -> None:
+    for campo in CAMPOS:
+        c = chave(jogo, campo, colecao, posicao)
+        if c is not None:
+            insort(indices[campo], c)
+    indices["n"] += 1
+
+
+def remover(indices: Dict[str, Any], jogo: Dict[str, Any], colecao: str, posicao: int) -> None:
+    for campo in CAMPOS:
+        c = chave(jogo, campo, colecao, posicao)
+        if c is None:
+            continue
+        lista = indices[campo]
+        i = bisect_left(lista, c)
+        if i < len(lista) and lista[i] == c:
+            del lista[i]
+    indices["n"] -= 1
+
+
+def posicao(lista: List[List[Any]], c: List[Any]) -> int:
+    """Quantidade de entradas que vêm antes da chave `c`."""
+    return bisect_left(lista, c)
+
+
+def _primeiro_com_valor_maior_ou_igual(lista: List[List[Any]], valor: float) -> int:
+    # bisect pelo primeiro elemento da chave (o título não importa aqui)
+    lo, hi = 0, len(lista)
+    while lo < hi:
+        meio = (lo + hi) // 2
+        if lista[meio][0] < valor:
+            lo = meio + 1
+        else:
+            hi = meio
+    return lo
+
+
+def _primeiro_com_valor_maior(lista: List[List[Any]], valor: float) -> int:
+    lo, hi = 0, len(lista)
+    while lo < hi:
+        meio = (lo + hi) // 2
+        if lista[meio][0] <= valor:
+            lo = meio + 1
+        else:
+            hi = meio
+    return lo
+
+
+def faixa(lista: List[List[Any]], minimo: float, maximo: float) -> Tuple[int, int]:
+    """Intervalo [início, fim) das entradas com minimo <= valor <= maximo."""
+    # Os valores estão negados: minimo <= v <= maximo  <=>  -maximo <= -v <= -minimo
+    return (_primeiro_com_valor_maior_ou_igual(lista, -maximo),
+            _primeiro_com_valor_maior(lista, -minimo))
@@ -1,16 +1,48 @@
-from typing import List
-from models.jogo import Jogo
-from models.status import StatusJogo
+import heapq
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+from .jogo import Jogo
+from .status import StatusJogo
+from ..perfil import medido
+
+
+def _pagina(jogos: Iterable[Jogo], limite: Optional[int], offset: int) -> List[Jogo]:
+    """Pula `offset` jogos e pega até `limite`, parando a iteração assim que possível."""
+    return list(islice(jogos, offset, None if limite is None else offset + limite))
 
 
 class Relatorio:
     def __init__(self, jogos: List[Jogo]):
         self.jogos = jogos
 
+    @staticmethod
+    def chave_horas(j: Jogo) -> Tuple[float, str]:
+        """Chave de ordenação por horas: maior primeiro, empates pelo título."""
+        return (-j.horas_jogadas, j.titulo.lower())
+
+    @staticmethod
+    def chave_avaliacao(j: Jogo) -> Tuple[float, str]:
+        """Chave de ordenação por avaliação: maior primeiro, empates pelo título."""
+        return (-j.avaliacao, j.titulo.lower())
+
+    @staticmethod
+    def _ordenar(jogos: Iterable[Jogo], chave, limite: Optional[int], offset: int,
+                 apos: Optional[Tuple]) -> List[Jogo]:
+        if apos is not None:
+            # Paginação por chave: só o que vem depois do último item da página anterior
+            apos = tuple(apos)
+            jogos = (j for j in jogos if chave(j) > apos)
+        if limite is None:
+            return sorted(jogos, key=chave)[offset:]
+        # Seleciona só os primeiros offset+limite com um heap, sem ordenar tudo
+        return heapq.nsmallest(offset + limite, jogos, key=chave)[offset:]
+
+    @medido("relatorio.total_horas")
     def total_horas(self) -> float:
         """Total de horas jogadas no catálogo."""
         return sum(j.horas_jogadas for j in self.jogos)
 
+    @medido("relatorio.media_avaliacao_finalizados")
     def media_avaliacao_finalizados(self) -> float:
         """Média de avaliação dos jogos finalizados."""
         finalizados = [j for j in self.jogos if j.status ==
@@ -19,6 +51,7 @@ class Relatorio:
             return 0.0
         return sum(j.avaliacao for j in finalizados) / len(finalizados)
 
+    @medido("relatorio.percentual_por_status")
     def percentual_por_status(self) -> dict:
         """Percentual de jogos por status."""
         if not self.jogos:
@@ -30,31 +63,43 @@ class Relatorio:
             resultado[status.value] = (count / total) * 100
         return resultado
 
+    @medido("relatorio.top_5_mais_jogados")
     def top_5_mais_jogados(self) -> List[Jogo]:
         """Top 5 jogos mais jogados."""
-        return sorted(self.jogos, key=lambda j: j.horas_jogadas, reverse=True)[:5]
+        return heapq.nlargest(5, self.jogos, key=lambda j: j.horas_jogadas)
 
-    def filtrar_por_genero(self, genero: str) -> List[Jogo]:
+    @medido("relatorio.filtrar_por_genero")
+    def filtrar_por_genero(self, genero: str, limite: Optional[int] = None, offset: int = 0) -> List[Jogo]:
         """Filtrar jogos por gênero."""
-        return [j for j in self.jogos if j.genero.lower() == genero.lower()]
+        genero = genero.lower()
+        return _pagina((j for j in self.jogos if j.genero.lower() == genero), limite, offset)
 
-    def filtrar_por_plataforma(self, plataforma: str) -> List[Jogo]:
+    @medido("relatorio.filtrar_por_plataforma")
+    def filtrar_por_plataforma(self, plataforma: str, limite: Optional[int] = None, offset: int = 0) -> List[Jogo]:
         """Filtrar jogos por plataforma."""
-        return [j for j in self.jogos if j.plataforma.lower() == plataforma.lower()]
+        plataforma = plataforma.lower()
+        return _pagina((j for j in self.jogos if j.plataforma.lower() == plataforma), limite, offset)
 
-    def filtrar_por_status(self, status: StatusJogo) -> List[Jogo]:
+    @medido("relatorio.filtrar_por_status")
+    def filtrar_por_status(self, status: StatusJogo, limite: Optional[int] = None, offset: int = 0) -> List[Jogo]:
         """Filtrar jogos por status."""
-        return [j for j in self.jogos if j.status == status]
+        return _pagina((j for j in self.jogos if j.status == status), limite, offset)
 
-    def buscar_por_titulo(self, titulo: str) -> List[Jogo]:
+    @medido("relatorio.buscar_por_titulo")
+    def buscar_por_titulo(self, titulo: str, limite: Optional[int] = None, offset: int = 0) -> List[Jogo]:
         """Buscar jogos por parte do título."""
-        return [j for j in self.jogos if titulo.lower() in j.titulo.lower()]
+        titulo = titulo.lower()
+        return _pagina((j for j in self.jogos if titulo in j.titulo.lower()), limite, offset)
 
-    def ordenar_por_horas(self) -> List[Jogo]:
-        """Ordenar lista por tempo jogado."""
-        return sorted(self.jogos, key=lambda j: j.horas_jogadas, reverse=True)
+    @medido("relatorio.ordenar_por_horas")
+    def ordenar_por_horas(self, limite: Optional[int] = None, offset: int = 0,
+                          apos: Optional[Tuple] = None) -> List[Jogo]:
+        """Ordenar lista por tempo jogado (`apos` é a chave_horas do último item já exibido)."""
+        return self._ordenar(self.jogos, self.chave_horas, limite, offset, apos)
 
-    def ordenar_por_avaliacao(self) -> List[Jogo]:
-        """Ordenar lista por avaliação."""
-        return sorted([j for j in self.jogos if j.avaliacao],
-                      key=lambda j: j.avaliacao, reverse=True)
+    @medido("relatorio.ordenar_por_avaliacao")
+    def ordenar_por_avaliacao(self, limite: Optional[int] = None, offset: int = 0,
+                              apos: Optional[Tuple] = None) -> List[Jogo]:
+        """Ordenar lista por avaliação (`apos` é a chave_avaliacao do último item já exibido)."""
+        return self._ordenar((j for j in self.jogos if j.avaliacao), self.chave_avaliacao,
+                             limite, offset, apos)
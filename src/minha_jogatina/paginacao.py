@@ -0,0 +1,98 @@
+"""
+Paginação e formatos de saída dos comandos de listagem da CLI.
+
+Um cursor é um texto opaco (JSON em base64) que guarda onde a página anterior
+parou: {"offset": n} para listagens na ordem do armazenamento, ou
+{"apos": chave} para listagens ordenadas, onde `chave` é a chave de ordenação do
+último item exibido.
+"""
+
+import base64
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+FORMATOS = ["texto", "json", "tsv"]
+CAMPOS = ["titulo", "genero", "plataforma", "status", "horas_jogadas", "avaliacao"]
+
+
+def codificar_cursor(estado: Dict[str, Any]) -> str:
+    texto = json.dumps(estado, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii")
+
+
+def decodificar_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        estado = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError:
+        raise ValueError("Cursor inválido.")
+    if not isinstance(estado, dict):
+        raise ValueError("Cursor inválido.")
+    return estado
+
+
+def registro_de_jogo(jogo) -> Dict[str, Any]:
+    """Campos de um objeto Jogo para as saídas json/tsv."""
+    return {
+        "titulo": jogo.titulo,
+        "genero": jogo.genero,
+        "plataforma": jogo.plataforma,
+        "status": jogo.status.value,
+        "horas_jogadas": jogo.horas_jogadas,
+        "avaliacao": jogo.avaliacao,
+    }
+
+
+def registro_de_dict(g: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de um jogo no formato do armazenamento para as saídas json/tsv."""
+    return {
+        "titulo": g.get("title"),
+        "genero": g.get("genero"),
+        "plataforma": g.get("platform"),
+        "status": g.get("status"),
+        "horas_jogadas": g.get("horas_jogadas"),
+        "avaliacao": g.get("avaliacao"),
+    }
+
+
+def escrever_linhas(linhas: Iterable[str], saida: TextIO = sys.stdout, tamanho_bloco: int = 1000) -> None:
+    """Escreve as linhas em blocos, com uma única chamada de write() por bloco."""
+    bloco: List[str] = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= tamanho_bloco:
+            saida.write("\n".join(bloco) + "\n")
+            bloco = []
+    if bloco:
+        saida.write("\n".join(bloco) + "\n")
+
+
+def _tsv(valor: Any) -> str:
+    if valor is None:
+        return ""
+    return str(valor).replace("\t", " ").replace("\n", " ")
+
+
+def emitir(itens: List[Any], formato: str, texto: Callable[[Any], str],
+           registro: Callable[[Any], Dict[str, Any]], proximo_cursor: Optional[str] = None,
+           saida: TextIO = sys.stdout) -> None:
+    """
+    Exibe uma página de resultados.
+
+    Em "json" a saída é {"itens": [...], "proximo_cursor": ...}. Em "texto" e "tsv"
+    o cursor da próxima página (se houver) vai para a saída de erro, deixando a
+    saída padrão só com os dados.
+    """
+    if formato == "json":
+        json.dump({"itens": [registro(i) for i in itens], "proximo_cursor": proximo_cursor},
+                  saida, ensure_ascii=False)
+        saida.write("\n")
+        return
+    if formato == "tsv":
+        linhas = ("\t".join(_tsv(r[c]) for c in CAMPOS) for r in map(registro, itens))
+        escrever_linhas(["\t".join(CAMPOS)], saida)
+        escrever_linhas(linhas, saida)
+    else:
+        escrever_linhas(map(texto, itens), saida)
+    if proximo_cursor:
+        print(f"Próxima página: --cursor {proximo_cursor}", file=sys.stderr)
@@ -0,0 +1,137 @@
+"""
+Instrumentação opcional de tempo e E/S para os comandos da CLI.
+
+Enquanto nenhuma sessão de perfil estiver ativa, os ganchos abaixo não fazem nada:
+fase() devolve um contexto vazio compartilhado e contar() retorna imediatamente.
+Com uma sessão ativa (main.py --perfil ou a variável MINHA_JOGATINA_PERFIL), são
+registrados o tempo de cada fase, a quantidade de registros processados, os bytes
+lidos e gravados e o pico de memória do processo.
+"""
+
+import cProfile
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de memória
+    resource = None
+
+_NULO = nullcontext()
+_atual: Optional["Perfil"] = None
+
+
+class Perfil:
+    def __init__(self, comando: str):
+        self.comando = comando
+        self.fases: Dict[str, Dict[str, float]] = {}
+        self.registros = 0
+        self.bytes_lidos = 0
+        self.bytes_gravados = 0
+        self.tempo_total = 0.0
+
+    @contextmanager
+    def fase(self, nome: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            dados = self.fases.setdefault(nome, {"tempo_s": 0.0, "chamadas": 0})
+            dados["tempo_s"] += time.perf_counter() - inicio
+            dados["chamadas"] += 1
+
+    def resumo(self) -> Dict[str, Any]:
+        pico = None
+        if resource is not None:
+            # ru_maxrss é em KB no Linux e em bytes no macOS
+            pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            pico = pico if sys.platform == "darwin" else pico * 1024
+        return {
+            "comando": self.comando,
+            "tempo_total_s": self.tempo_total,
+            "fases": self.fases,
+            "registros": self.registros,
+            "bytes_lidos": self.bytes_lidos,
+            "bytes_gravados": self.bytes_gravados,
+            "memoria_pico_bytes": pico,
+        }
+
+    def imprimir(self, arquivo=sys.stderr) -> None:
+        r = self.resumo()
+        print(f"Perfil de '{self.comando}':", file=arquivo)
+        print(f"  {'fase':<40} {'tempo (ms)':>12} {'chamadas':>9}", file=arquivo)
+        for nome, dados in sorted(self.fases.items(), key=lambda f: -f[1]["tempo_s"]):
+            print(f"  {nome:<40} {dados['tempo_s'] * 1000:>12.2f} {dados['chamadas']:>9}", file=arquivo)
+        print(f"  {'total':<40} {self.tempo_total * 1000:>12.2f}", file=arquivo)
+        print(f"  registros processados: {r['registros']}", file=arquivo)
+        print(f"  bytes lidos: {r['bytes_lidos']}, gravados: {r['bytes_gravados']}", file=arquivo)
+        if r["memoria_pico_bytes"] is not None:
+            print(f"  memória de pico: {r['memoria_pico_bytes'] / 2 ** 20:.1f} MB", file=arquivo)
+
+
+def ativo() -> bool:
+    return _atual is not None
+
+
+def fase(nome: str):
+    """Contexto que cronometra uma fase (vazio se o perfil estiver desativado)."""
+    if _atual is None:
+        return _NULO
+    return _atual.fase(nome)
+
+
+def contar(registros: int = 0, bytes_lidos: int = 0, bytes_gravados: int = 0) -> None:
+    if _atual is None:
+        return
+    _atual.registros += registros
+    _atual.bytes_lidos += bytes_lidos
+    _atual.bytes_gravados += bytes_gravados
+
+
+def medido(nome: str):
+    """Decorador que registra cada chamada da função como uma fase."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if _atual is None:
+                return funcao(*args, **kwargs)
+            with _atual.fase(nome):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+@contextmanager
+def sessao(comando: str, saida: Optional[str] = None):
+    """
+    Ativa o perfil durante o bloco e emite o resultado ao final.
+
+    Sem `saida`, o resumo é impresso na saída de erro. Se `saida` terminar em
+    ".prof", o bloco também roda sob cProfile e as estatísticas são gravadas nesse
+    arquivo (para uso com pstats/snakeviz); caso contrário o resumo é gravado em JSON.
+    """
+    global _atual
+    _atual = perfil = Perfil(comando)
+    profiler = cProfile.Profile() if saida and saida.endswith(".prof") else None
+    inicio = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield perfil
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        perfil.tempo_total = time.perf_counter() - inicio
+        _atual = None
+        if profiler is not None:
+            profiler.dump_stats(saida)
+            perfil.imprimir()
+        elif saida:
+            with open(saida, "w", encoding="utf-8") as f:
+                json.dump(perfil.resumo(), f, indent=2, ensure_ascii=False)
+        else:
+            perfil.imprimir()
@@ -0,0 +1,251 @@
+"""
+Histórico de sessões de jogo: um registro só de inclusão, indexado por tempo.
+
+Cada sessão é uma linha no arquivo de registro, sempre acrescentada ao final:
+    <instante (segundos desde 1970)>\\t<coleção>\\t<título>\\t<gênero>\\t<horas jogadas na sessão>\\t<novo status ou vazio>
+
+Junto do registro fica um arquivo de resumos ("<caminho>.resumos.json") com
+totais já calculados por dia, semana (ISO), mês e ano, e por gênero em cada
+mês: {"horas": ..., "sessoes": ..., "finalizados": ...}. Os resumos são
+atualizados a cada inclusão, então consultas por período não releem o
+registro. O arquivo de resumos também guarda, para cada dia, a posição (em
+bytes) da primeira sessão daquele dia, o que permite listar um intervalo de
+datas lendo só o trecho correspondente do registro.
+
+As sessões normalmente chegam em ordem de tempo, mas não obrigatoriamente
+(ex.: sessões antigas informadas com `instante`, ou dois processos gravando
+quase ao mesmo tempo). Os resumos guardam se o registro continua em ordem;
+enquanto estiver, a leitura de um intervalo para na primeira sessão depois
+do fim dele, e depois disso o registro é lido até o fim.
+
+Os resumos guardam até que posição do registro já foram calculados; se o
+registro tiver linhas além dessa posição (ex.: o processo terminou entre as
+duas gravações), elas são incluídas na próxima leitura. Sem o arquivo de
+resumos, eles são reconstruídos a partir do registro inteiro.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from datetime import date, datetime, time as hora_do_dia
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .armazenamento import _gravar_json, _ler_json, _travar
+from .models.status import StatusJogo
+
+PERIODOS = ["dia", "semana", "mes", "ano"]
+
+
+def _vazio() -> Dict[str, Any]:
+    return {"horas": 0.0, "sessoes": 0, "finalizados": 0}
+
+
+def _novos_resumos() -> Dict[str, Any]:
+    resumos: Dict[str, Any] = {periodo: {} for periodo in PERIODOS}
+    resumos.update({"genero": {}, "inicio_dia": {}, "posicao": 0, "ultimo_instante": None, "em_ordem": True})
+    return resumos
+
+
+def chaves_periodo(dia: date) -> Dict[str, str]:
+    """Chave de cada período que contém o dia, ex.: {"semana": "2026-W42", "mes": "2026-10", ...}."""
+    ano_iso, semana, _ = dia.isocalendar()
+    return {
+        "dia": dia.isoformat(),
+        "semana": f"{ano_iso}-W{semana:02d}",
+        "mes": f"{dia.year}-{dia.month:02d}",
+        "ano": str(dia.year),
+    }
+
+
+def _limpar(texto: str) -> str:
+    return (texto or "").replace("\t", " ").replace("\n", " ")
+
+
+def _linha(sessao: Dict[str, Any]) -> bytes:
+    campos = [str(int(sessao["instante"])), _limpar(sessao["colecao"]), _limpar(sessao["titulo"]),
+              _limpar(sessao["genero"]), repr(float(sessao["horas"])), sessao.get("status") or ""]
+    return ("\t".join(campos) + "\n").encode("utf-8")
+
+
+def _ler_linha(linha: bytes) -> Optional[Dict[str, Any]]:
+    partes = linha.decode("utf-8").rstrip("\n").split("\t")
+    if len(partes) != 6:
+        # Linha incompleta (gravação interrompida): é ignorada
+        return None
+    instante, colecao, titulo, genero, horas, status = partes
+    return {"instante": int(instante), "colecao": colecao, "titulo": titulo, "genero": genero,
+            "horas": float(horas), "status": status or None}
+
+
+def _acumular(resumos: Dict[str, Any], sessao: Dict[str, Any], posicao: int) -> None:
+    chaves = chaves_periodo(datetime.fromtimestamp(sessao["instante"]).date())
+    finalizou = sessao.get("status") == StatusJogo.FINALIZADO.value
+    por_genero = resumos["genero"].setdefault(chaves["mes"], {})
+    for total in [resumos[p].setdefault(chaves[p], _vazio()) for p in PERIODOS] + \
+                 [por_genero.setdefault(sessao["genero"] or "", _vazio())]:
+        total["horas"] += sessao["horas"]
+        total["sessoes"] += 1
+        total["finalizados"] += finalizou
+    # As posições só crescem, então este é o início do dia no registro mesmo fora de ordem
+    resumos["inicio_dia"].setdefault(chaves["dia"], posicao)
+    instante = int(sessao["instante"])
+    if resumos["ultimo_instante"] is not None and instante < resumos["ultimo_instante"]:
+        resumos["em_ordem"] = False
+    resumos["ultimo_instante"] = max(instante, resumos["ultimo_instante"] or instante)
+
+
+def _somar(totais: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    soma = _vazio()
+    for total in totais:
+        for campo in soma:
+            soma[campo] += total[campo]
+    return soma
+
+
+def nova_sessao(colecao: str, jogo: Dict[str, Any], horas: float, status: Optional[str] = None,
+                instante: Optional[float] = None) -> Dict[str, Any]:
+    """Sessão de um jogo no formato do armazenamento (instante padrão: agora)."""
+    return {
+        "instante": time.time() if instante is None else instante,
+        "colecao": colecao,
+        "titulo": jogo["title"],
+        "genero": jogo.get("genero") or "",
+        "horas": horas,
+        "status": status,
+    }
+
+
+class HistoricoSessoes:
+    """Registro de sessões em `caminho` e seus resumos em "<caminho>.resumos.json"."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.caminho_resumos = caminho + ".resumos.json"
+
+    # ===== GRAVAÇÃO =====
+
+    def registrar(self, colecao: str, jogo: Dict[str, Any], horas: float,
+                  status: Optional[str] = None, instante: Optional[float] = None) -> None:
+        """Acrescenta uma sessão do jogo (no formato do armazenamento)."""
+        self.registrar_varias([nova_sessao(colecao, jogo, horas, status, instante)])
+
+    def registrar_varias(self, sessoes: List[Dict[str, Any]]) -> None:
+        """
+        Acrescenta várias sessões com uma única trava, uma escrita no registro e
+        uma gravação dos resumos.
+        """
+        if not sessoes:
+            return
+        with _travar(self.caminho, exclusiva=True):
+            resumos = self._resumos_em_dia()
+            with open(self.caminho, "ab") as f:
+                # Uma gravação interrompida pode ter deixado uma linha incompleta no fim
+                # (os resumos param antes dela): ela é descartada, senão a nova sessão
+                # seria colada nela
+                posicao = resumos["posicao"]
+                f.truncate(posicao)
+                linhas = []
+                for sessao in sessoes:
+                    linha = _linha(sessao)
+                    _acumular(resumos, sessao, posicao)
+                    posicao += len(linha)
+                    linhas.append(linha)
+                f.write(b"".join(linhas))
+            resumos["posicao"] = posicao
+            _gravar_json(self.caminho_resumos, resumos, sincronizar=False)
+
+    # ===== LEITURA =====
+
+    def _resumos_em_dia(self) -> Dict[str, Any]:
+        # Chamado com o registro travado
+        try:
+            tamanho = os.path.getsize(self.caminho)
+        except FileNotFoundError:
+            tamanho = 0
+        try:
+            resumos = _ler_json(self.caminho_resumos)
+        except FileNotFoundError:
+            resumos = _novos_resumos()
+        if resumos["posicao"] > tamanho:
+            # O registro foi substituído: os resumos são refeitos do zero
+            resumos = _novos_resumos()
+        if resumos["posicao"] < tamanho:
+            with open(self.caminho, "rb") as f:
+                f.seek(resumos["posicao"])
+                for linha in f:
+                    if not linha.endswith(b"\n"):
+                        break
+                    sessao = _ler_linha(linha)
+                    if sessao is not None:
+                        _acumular(resumos, sessao, resumos["posicao"])
+                    resumos["posicao"] += len(linha)
+        return resumos
+
+    def resumos(self) -> Dict[str, Any]:
+        with _travar(self.caminho, exclusiva=False):
+            return self._resumos_em_dia()
+
+    def totais(self, periodo: str, de: Optional[date] = None,
+               ate: Optional[date] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Pares (chave do período, totais) em ordem, entre as datas `de` e `ate` (inclusive)."""
+        por_periodo = self.resumos()[periodo]
+        inicio = chaves_periodo(de)[periodo] if de else ""
+        fim = chaves_periodo(ate)[periodo] if ate else None
+        return [(chave, por_periodo[chave]) for chave in sorted(por_periodo)
+                if chave >= inicio and (fim is None or chave <= fim)]
+
+    def totais_por_genero(self, de: Optional[date] = None,
+                          ate: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Totais por gênero nos meses entre `de` e `ate`."""
+        genero_mes = self.resumos()["genero"]
+        inicio = chaves_periodo(de)["mes"] if de else ""
+        fim = chaves_periodo(ate)["mes"] if ate else None
+        por_genero: Dict[str, List[Dict[str, Any]]] = {}
+        for mes, generos in genero_mes.items():
+            if mes >= inicio and (fim is None or mes <= fim):
+                for genero, total in generos.items():
+                    por_genero.setdefault(genero, []).append(total)
+        return {genero: _somar(totais) for genero, totais in sorted(por_genero.items())}
+
+    def total(self, periodo: str, chave: str) -> Dict[str, Any]:
+        """Totais de um período, ex.: total("ano", "2026") ou total("mes", "2026-10")."""
+        return dict(self.resumos()[periodo].get(chave, _vazio()))
+
+    def percorrer(self, de: Optional[date] = None, ate: Optional[date] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Gera as sessões entre as datas `de` e `ate` (inclusive), na ordem do registro.
+
+        A leitura começa na menor posição entre os inícios dos dias a partir de
+        `de` e, se o registro estiver em ordem de tempo, para na primeira sessão
+        depois de `ate` (senão, as sessões fora do intervalo são só puladas).
+        """
+        with _travar(self.caminho, exclusiva=False):
+            resumos = self._resumos_em_dia()
+            posicao = 0
+            if de is not None:
+                dias = sorted(resumos["inicio_dia"])
+                i = bisect_left(dias, de.isoformat())
+                if i == len(dias):
+                    return
+                # Fora de ordem, um dia pode começar no registro antes de um dia anterior
+                posicao = min(resumos["inicio_dia"][dia] for dia in dias[i:])
+            limite = datetime.combine(ate, hora_do_dia.max).timestamp() if ate is not None else None
+            inicio = datetime.combine(de, hora_do_dia.min).timestamp() if de is not None else None
+            try:
+                f = open(self.caminho, "rb")
+            except FileNotFoundError:
+                return
+            with f:
+                f.seek(posicao)
+                for linha in f:
+                    if not linha.endswith(b"\n"):
+                        break
+                    sessao = _ler_linha(linha)
+                    if sessao is None:
+                        continue
+                    if limite is not None and sessao["instante"] > limite:
+                        if resumos["em_ordem"]:
+                            break
+                        continue
+                    if inicio is None or sessao["instante"] >= inicio:
+                        yield sessao